@@ -3,18 +3,41 @@
 Nkrane-GT - Enhanced Machine Translation with Terminology Control (Google Translate)
 """
 
-from .translator import NkraneTranslator
-from .terminology_manager import TerminologyManager
-from .utils import list_available_options, export_terminology, create_sample_terminology
-from .language_codes import convert_lang_code, is_google_supported
+import importlib
 
 __version__ = "0.3.0"
-__all__ = [
-    'NkraneTranslator', 
-    'TerminologyManager', 
-    'convert_lang_code',
-    'is_google_supported',
-    'list_available_options', 
-    'export_terminology', 
-    'create_sample_terminology'
-]
+
+# Public names and the submodules that define them. Submodules are imported
+# on first access, so `import nkrane_gt` (and the CLI's daemon client) does
+# not pay for loading spaCy until a translator is actually needed.
+_EXPORTS = {
+    'NkraneTranslator': '.translator',
+    'TerminologyManager': '.terminology_manager',
+    'TranslationResult': '.result',
+    'TranslationMemory': '.translation_memory',
+    'incremental_translate': '.incremental',
+    'AdaptiveGovernor': '.governor',
+    'CircuitOpenError': '.governor',
+    'governor_stats': '.governor',
+    'TranslationScheduler': '.scheduler',
+    'convert_lang_code': '.language_codes',
+    'is_google_supported': '.language_codes',
+    'list_available_options': '.utils',
+    'export_terminology': '.utils',
+    'create_sample_terminology': '.utils',
+    'iter_terminology': '.utils',
+    'stream_export_terminology': '.utils',
+    'convert_terminology': '.utils',
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -6,7 +6,8 @@ Simple translation tool with terminology control
 
 import argparse
 import sys
-from nkrane_gt import NkraneTranslator
+
+from nkrane_gt.compression import open_text
 
 def main():
     parser = argparse.ArgumentParser(
@@ -29,6 +30,22 @@ Examples:
   # Batch translate from file
   python run.py -f input.txt -t ak -c my_terms.csv -o output.txt
 
+  # Keep models warm between calls (later calls forward to it automatically)
+  nkrane-daemon start &
+
+  # Estimate requests, characters and time for a job without translating
+  python run.py -f input.txt -t ak -c my_terms.csv --dry-run
+
+  # Re-translate a revised file, reusing last run's output for unchanged lines
+  python run.py -f input_v2.txt -t ak -c my_terms.csv -o output_v2.txt \
+      --previous-source input_v1.txt --previous-translation output_v1.txt
+
+  # Translate the 'title' and 'body' columns of a dataset
+  python run.py -f data.csv --columns title,body -t ak -c my_terms.csv -o data_ak.csv
+
+  # Batch translate a large file with 8 worker processes
+  python run.py -f input.txt -t ak -c my_terms.csv -o output.txt -j 8
+
 Supported target languages:
   ak   - Akan/Twi
   ee   - Ewe
@@ -49,7 +66,7 @@ Supported target languages:
     )
     input_group.add_argument(
         '-f', '--file',
-        help='Input file with text to translate (one sentence per line)'
+        help='Input file with text to translate (one sentence per line); .gz, .zst and .xz files are decompressed on the fly'
     )
     
     # Language arguments
@@ -78,6 +95,74 @@ Supported target languages:
         help='Output file path (optional, defaults to stdout)'
     )
     
+    # Parallel batch mode
+    parser.add_argument(
+        '-j', '--workers',
+        type=int,
+        default=1,
+        help='Worker processes for --file mode (default: 1, no process pool)'
+    )
+    
+    # Incremental mode
+    parser.add_argument(
+        '--previous-source',
+        help='Previous version of --file; only changed lines/sentences are re-translated'
+    )
+    parser.add_argument(
+        '--previous-translation',
+        help='Translation output for --previous-source (one line per non-empty source line)'
+    )
+    
+    # Dataset mode
+    parser.add_argument(
+        '--columns',
+        help='Comma-separated columns to translate when --file is a CSV/TSV/JSONL/Parquet dataset'
+    )
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=1000,
+        help='Rows per chunk in dataset mode (default: 1000)'
+    )
+    
+    # Translation memory
+    parser.add_argument(
+        '--memory',
+        help='Translation memory file (JSONL) to reuse and extend; see nkrane-memory for bulk import'
+    )
+    
+    # Warm daemon
+    parser.add_argument(
+        '--no-daemon',
+        action='store_true',
+        help='Always translate in-process, even if a warm daemon is running'
+    )
+    parser.add_argument(
+        '--socket',
+        help='Daemon socket path (default: $NKRANE_SOCKET or a per-user path)'
+    )
+    
+    # Output compression
+    parser.add_argument(
+        '--compression',
+        choices=['gzip', 'zstd', 'xz', 'none'],
+        help='Compress the output file (default: from its extension, e.g. .gz, .zst, .xz)'
+    )
+    
+    # Hedged requests
+    parser.add_argument(
+        '--hedge',
+        action='store_true',
+        help='Duplicate unusually slow upstream requests and use the first answer (cuts tail latency)'
+    )
+    
+    # Dry run
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='Only preprocess and report the estimated requests, characters and time (no network calls)'
+    )
+    
     # Debug mode
     parser.add_argument(
         '--debug',
@@ -94,34 +179,184 @@ Supported target languages:
     
     args = parser.parse_args()
     
+    if args.columns and not (args.file and args.output):
+        parser.error('--columns requires --file and --output')
+    if args.compression and not args.output:
+        parser.error('--compression requires --output')
+    if args.dry_run and args.columns:
+        parser.error('--dry-run cannot be combined with --columns')
+    if bool(args.previous_source) != bool(args.previous_translation) or \
+            (args.previous_source and not args.file):
+        parser.error('--previous-source and --previous-translation must be used together with --file')
+    if args.workers > 1:
+        # The worker pool translates plain line files with default translators
+        unsupported = [flag for flag, value in (('--columns', args.columns),
+                                                ('--previous-source', args.previous_source),
+                                                ('--memory', args.memory),
+                                                ('--hedge', args.hedge),
+                                                ('--debug', args.debug)) if value]
+        if unsupported:
+            parser.error(f"-j/--workers cannot be combined with {', '.join(unsupported)}")
+    
     # Suppress logging if quiet mode
     if args.quiet:
         import logging
         logging.getLogger().setLevel(logging.ERROR)
     
     try:
-        # Initialize translator
-        if not args.quiet:
-            print(f"🚀 Initializing translator ({args.source} → {args.target})...")
-        
-        translator = NkraneTranslator(
-            target_lang=args.target,
-            src_lang=args.source,
-            terminology_source=args.terminology
-        )
+        if args.file and args.workers > 1 and not args.dry_run:
+            # Sharded translation across worker processes
+            from nkrane_gt.parallel import parallel_translate_file
+            
+            if not args.quiet:
+                print(f"🚀 Translating {args.file} with {args.workers} workers ({args.source} → {args.target})...")
+            
+            stats = parallel_translate_file(
+                args.file,
+                args.output or sys.stdout,
+                target_lang=args.target,
+                src_lang=args.source,
+                terminology_source=args.terminology,
+                workers=args.workers,
+                compression=args.compression
+            )
+            
+            if not args.output:
+                print()
+            elif not args.quiet:
+                print(f"\n💾 Translation saved to {args.output}")
+            if not args.quiet:
+                print(f"📄 Translated {stats['lines']} lines in {stats['shards']} shards ({stats['errors']} errors)")
+                print("\n✨ Done!")
+            return
         
         # Get text to translate
-        if args.file:
+        if args.file and not args.columns:
             # Read from file
-            with open(args.file, 'r', encoding='utf-8') as f:
+            with open_text(args.file, 'r') as f:
                 texts = [line.strip() for line in f if line.strip()]
             
-            if not args.quiet:
+            if not args.quiet and not args.dry_run:
                 print(f"📄 Loaded {len(texts)} lines from {args.file}")
+        else:
+            texts = [args.text]
+        
+        # Forward plain translations to a warm daemon when one is running
+        results = None
+        translator = None
+        if not (args.no_daemon or args.memory or args.hedge or args.debug or args.dry_run or args.columns
+                or args.previous_source):
+            from nkrane_gt.daemon import DaemonClient
+            
+            results = DaemonClient(args.socket).translate(
+                texts,
+                target_lang=args.target,
+                src_lang=args.source,
+                terminology_source=args.terminology,
+                # Same classes as in-process: a single text fails fast, files wait
+                priority='bulk' if args.file else 'interactive'
+            )
+            if results is not None and not args.quiet:
+                print(f"⚡ Translated by warm daemon ({args.source} → {args.target})")
+        
+        if results is None:
+            # Initialize translator
+            from nkrane_gt import NkraneTranslator
+            
+            if not args.quiet:
+                print(f"🚀 Initializing translator ({args.source} → {args.target})...")
+            
+            memory = None
+            if args.memory:
+                import os
+                from nkrane_gt import TranslationMemory
+                
+                memory = TranslationMemory(src_lang=args.source, target_lang=args.target)
+                if os.path.exists(args.memory):
+                    memory.load(args.memory)
+                    if not args.quiet:
+                        print(f"🧠 Loaded {len(memory)} translation memory entries from {args.memory}")
+            
+            translator = NkraneTranslator(
+                target_lang=args.target,
+                src_lang=args.source,
+                terminology_source=args.terminology,
+                translation_memory=memory,
+                hedge_requests=args.hedge
+            )
             
-            # Batch translate
-            results = translator.batch_translate(texts, debug=args.debug)
+            if args.dry_run:
+                # Preprocess only and report what the job would cost
+                estimate = translator.batch_translate(texts, dry_run=True)
+                
+                print(f"\n🧮 Dry run ({args.source} → {args.target}), no requests sent:")
+                print(f"   Texts:            {estimate['texts']} ({estimate['unique_texts']} unique)")
+                print(f"   Requests:         {estimate['requests']}")
+                print(f"   Characters sent:  {estimate['characters_sent']}")
+                print(f"   Cache hits:       {estimate['cache_hits']}")
+                print(f"   Terms replaced:   {estimate['terms_replaced']}")
+                print(f"   Preprocessing:    {estimate['preprocess_time']:.2f}s")
+                print(f"   Estimated time:   {estimate['estimated_time']:.1f}s")
+                return
             
+            if args.columns:
+                # Dataset mode: translate selected columns chunk by chunk
+                from nkrane_gt.dataset import translate_dataset
+                
+                columns = [col.strip() for col in args.columns.split(',') if col.strip()]
+                stats = translate_dataset(
+                    translator,
+                    args.file,
+                    args.output,
+                    columns=columns,
+                    chunk_size=args.chunk_size,
+                    compression=args.compression
+                )
+                
+                if not args.quiet:
+                    print(f"\n📊 {stats['rows']} rows, {stats['cells']} cells: "
+                          f"{stats['translated']} translated, {stats['reused']} reused, {stats['errors']} errors")
+                    print(f"💾 Translation saved to {args.output}")
+                    print("\n✨ Done!")
+                return
+            
+            if not args.file:
+                # Single translation
+                results = [translator.translate(args.text, debug=args.debug)]
+            elif args.previous_source:
+                # Incremental: reuse translations of unchanged lines and sentences
+                from nkrane_gt.incremental import incremental_translate
+                
+                with open_text(args.previous_source, 'r') as f:
+                    previous_texts = [line.strip() for line in f if line.strip()]
+                # One output line per non-empty source line, empty translations
+                # included (the output has no final newline, so split rather
+                # than iterate); surplus trailing empty lines are dropped
+                with open_text(args.previous_translation, 'r') as f:
+                    previous_translations = [line.strip() for line in f.read().split('\n')]
+                while len(previous_translations) > len(previous_texts) and not previous_translations[-1]:
+                    previous_translations.pop()
+                
+                results, stats = incremental_translate(
+                    translator, texts, previous_texts, previous_translations,
+                    compact=True, verbose=args.debug
+                )
+                
+                if not args.quiet:
+                    print(f"♻️  Reused {stats['lines_reused']} lines and {stats['sentences_reused']} sentences, "
+                          f"translated {stats['sentences_translated']} sentences")
+            else:
+                # Batch translate
+                results = translator.batch_translate(texts, debug=args.debug, compact=True, verbose=args.debug)
+            
+            if memory is not None:
+                memory.save(args.memory)
+                if not args.quiet:
+                    stats = memory.stats
+                    print(f"🧠 Memory: {stats['exact_hits']} exact and {stats['fuzzy_hits']} fuzzy hits, "
+                          f"{len(memory)} entries saved to {args.memory}")
+        
+        if args.file:
             # Prepare output
             output_lines = []
             for i, result in enumerate(results):
@@ -136,9 +371,31 @@ Supported target languages:
             
             output_text = '\n'.join(output_lines)
             
+            if args.debug and not args.quiet and translator.terminology_manager.terms:
+                prefilter = translator.terminology_manager.get_prefilter_stats()
+                print(f"\n🔎 Prefilter: {prefilter['skipped']}/{prefilter['checked']} texts and "
+                      f"{prefilter['sentences_skipped']} sentences skipped parsing (no glossary words)")
+
+                integrity = translator.get_integrity_stats()
+                if integrity and integrity['sentences_broken']:
+                    print(f"🧩 Placeholders: {integrity['sentences_broken']} broken sentences "
+                          f"({integrity['missing']} missing, {integrity['duplicated']} duplicated, "
+                          f"{integrity['altered']} altered), {integrity['sentences_repaired']} repaired "
+                          f"with {integrity['retry_requests']} retries")
+            
+            if args.debug and not args.quiet and translator.governor:
+                stats = translator.get_governor_stats()
+                print(f"\n🚦 Upstream {stats['name']}: {stats['rate']} req/s, "
+                      f"{stats['concurrency_limit']} in flight, circuit {stats['circuit']}, "
+                      f"outcomes {stats['outcomes']}")
+            
+            if args.debug and not args.quiet and translator.hedger:
+                stats = translator.get_hedging_stats()
+                print(f"🪃 Hedging: {stats['hedged']}/{stats['requests']} requests hedged, "
+                      f"{stats['hedge_wins']} hedges answered first, delay {stats['hedge_delay']}s")
+            
         else:
-            # Single translation
-            result = translator.translate(args.text, debug=args.debug)
+            result = results[0]
             
             if 'error' in result:
                 print(f"❌ Error: {result['error']}", file=sys.stderr)
@@ -155,7 +412,7 @@ Supported target languages:
         
         # Output to file or stdout
         if args.output:
-            with open(args.output, 'w', encoding='utf-8') as f:
+            with open_text(args.output, 'w', args.compression) as f:
                 f.write(output_text)
             if not args.quiet:
                 print(f"\n💾 Translation saved to {args.output}")
@@ -0,0 +1,158 @@
+# nkrane_gt/compression.py
+"""
+Transparent gzip, zstd and xz streams for input and output files.
+
+Input files are recognized by their magic bytes, so a compressed corpus is
+read correctly whatever it is called. The bytes are peeked from the same
+open file that is then decompressed, so pipes and process substitutions
+('-f <(zcat corpus.gz)') work too. Output compression is chosen by an
+explicit argument or by the file extension (.gz, .zst, .xz). Streams are
+decompressed and compressed on the fly, so no decompressed copy is ever
+written to disk. zstd needs the optional zstandard package.
+"""
+
+import gzip
+import io
+import lzma
+import os
+from typing import Optional, TextIO
+
+COMPRESSION_NONE = 'none'
+COMPRESSION_GZIP = 'gzip'
+COMPRESSION_ZSTD = 'zstd'
+COMPRESSION_XZ = 'xz'
+
+COMPRESSIONS = (COMPRESSION_NONE, COMPRESSION_GZIP, COMPRESSION_ZSTD, COMPRESSION_XZ)
+
+COMPRESSION_EXTENSIONS = {
+    '.gz': COMPRESSION_GZIP,
+    '.gzip': COMPRESSION_GZIP,
+    '.zst': COMPRESSION_ZSTD,
+    '.zstd': COMPRESSION_ZSTD,
+    '.xz': COMPRESSION_XZ,
+}
+
+_MAGIC_BYTES = (
+    (b'\x1f\x8b', COMPRESSION_GZIP),
+    (b'\x28\xb5\x2f\xfd', COMPRESSION_ZSTD),
+    (b'\xfd7zXZ\x00', COMPRESSION_XZ),
+)
+
+def compression_from_path(path: str) -> Optional[str]:
+    """Compression implied by a file's extension, or None for other extensions."""
+    return COMPRESSION_EXTENSIONS.get(os.path.splitext(str(path))[1].lower())
+
+def strip_compression_suffix(path: str) -> str:
+    """Path without a compression extension ('data.jsonl.gz' -> 'data.jsonl')."""
+    root, ext = os.path.splitext(str(path))
+    return root if ext.lower() in COMPRESSION_EXTENSIONS else str(path)
+
+def _compression_from_magic(head: bytes) -> str:
+    for magic, compression in _MAGIC_BYTES:
+        if head.startswith(magic):
+            return compression
+    return COMPRESSION_NONE
+
+def detect_compression(path: str) -> str:
+    """
+    Compression of an existing file, from its magic bytes.
+
+    Reads from the file, so do not use it on a pipe that is read afterwards;
+    open_text() detects the compression itself.
+
+    Returns:
+        'gzip', 'zstd', 'xz' or 'none'
+    """
+    with open(path, 'rb') as f:
+        return _compression_from_magic(f.read(6))
+
+def is_compressed(path: str) -> bool:
+    """Whether an existing file is gzip, zstd or xz compressed."""
+    return detect_compression(path) != COMPRESSION_NONE
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("zstandard is required for .zst files: pip install zstandard")
+    return zstandard
+
+def open_text(path: str, mode: str = 'r', compression: Optional[str] = None,
+              encoding: str = 'utf-8', newline: Optional[str] = None) -> TextIO:
+    """
+    Open a text file, decompressing or compressing it on the fly.
+
+    Args:
+        path: File path
+        mode: 'r' to read or 'w' to write
+        compression: 'gzip', 'zstd', 'xz' or 'none'; by default detected from
+            the magic bytes when reading and from the extension when writing
+        encoding: Text encoding (default: utf-8)
+        newline: Passed to the text layer as with open()
+
+    Returns:
+        A text stream; closing it finishes the compressed stream
+
+    Raises:
+        ValueError: For an unknown compression or mode
+        ImportError: For zstd without the zstandard package
+    """
+    if mode not in ('r', 'w'):
+        raise ValueError(f"Unsupported mode: {mode} (use 'r' or 'w')")
+    if compression is not None and compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression: {compression}. Use one of: {', '.join(COMPRESSIONS)}")
+    if mode == 'r':
+        return _open_text_reader(path, compression, encoding, newline)
+
+    if compression is None:
+        compression = compression_from_path(path) or COMPRESSION_NONE
+    if compression == COMPRESSION_NONE:
+        return open(path, mode, encoding=encoding, newline=newline)
+    if compression == COMPRESSION_GZIP:
+        # Level 6 is several times faster to write than the default 9 for ~2% larger files
+        return gzip.open(path, 'wt', compresslevel=6, encoding=encoding, newline=newline)
+    if compression == COMPRESSION_XZ:
+        return lzma.open(path, 'wt', encoding=encoding, newline=newline)
+
+    zstandard = _zstandard()
+    raw = open(path, 'wb')
+    try:
+        stream = zstandard.ZstdCompressor(level=3).stream_writer(raw, closefd=True)
+    except Exception:
+        raw.close()
+        raise
+    return io.TextIOWrapper(stream, encoding=encoding, newline=newline)
+
+class _DecompressedText(io.TextIOWrapper):
+    """Text stream over a decompressor that also closes the underlying file."""
+
+    def __init__(self, stream, raw, **kwargs):
+        super().__init__(stream, **kwargs)
+        self._raw = raw
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            self._raw.close()
+
+def _open_text_reader(path: str, compression: Optional[str], encoding: str,
+                      newline: Optional[str]) -> TextIO:
+    # Open once and peek at the magic bytes, so nothing is consumed from a pipe
+    raw = open(path, 'rb')
+    try:
+        if compression is None:
+            compression = _compression_from_magic(raw.peek(6)[:6])
+
+        if compression == COMPRESSION_NONE:
+            return io.TextIOWrapper(raw, encoding=encoding, newline=newline)
+        if compression == COMPRESSION_GZIP:
+            stream = gzip.GzipFile(fileobj=raw, mode='rb')
+        elif compression == COMPRESSION_XZ:
+            stream = lzma.LZMAFile(raw, 'rb')
+        else:
+            stream = _zstandard().ZstdDecompressor().stream_reader(raw, closefd=False)
+        return _DecompressedText(stream, raw, encoding=encoding, newline=newline)
+    except Exception:
+        raw.close()
+        raise
@@ -0,0 +1,189 @@
+# nkrane_gt/corpus.py
+"""
+Bulk import and export of parallel corpora for the translation memory.
+
+Approved source/target pairs are read in streaming batches from two aligned
+files (one segment per line) or one TSV file (source<TAB>target), and run
+through TerminologyManager.preprocess_text so they are keyed exactly like
+live lookups. Where a glossary term's translation occurs once in the target
+segment, it is swapped for the matching placeholder, so the stored entry
+also serves later fuzzy matches; otherwise the target is stored as is,
+which is still the right answer for an exact repeat.
+
+Corpus files may be gzip, zstd or xz compressed (detected on import, chosen
+by extension on export).
+"""
+
+import argparse
+import csv
+import logging
+import os
+import re
+import sys
+from itertools import islice, zip_longest
+from typing import Dict, Iterator, Tuple
+
+from .compression import open_text
+from .translation_memory import TranslationMemory
+
+logger = logging.getLogger(__name__)
+
+# TSV dialect for both import and export: no quoting or escaping at all, so
+# quotes and backslashes survive a round trip. Exported fields have their
+# whitespace collapsed, so they never contain tabs or newlines.
+_TSV_FORMAT = {'delimiter': '\t', 'quoting': csv.QUOTE_NONE, 'quotechar': None}
+
+def iter_parallel_corpus(source_path: str, target_path: str = None) -> Iterator[Tuple[str, str]]:
+    """
+    Stream (source, target) pairs from aligned files or a TSV file.
+
+    Args:
+        source_path: Source file, or a TSV file if target_path is not given
+        target_path: Target file aligned line by line with source_path
+
+    Raises:
+        ValueError: If aligned files have different line counts
+    """
+    if target_path is None:
+        with open_text(source_path, 'r', newline='') as f:
+            for row in csv.reader(f, **_TSV_FORMAT):
+                if len(row) >= 2 and row[0].strip() and row[1].strip():
+                    yield row[0].strip(), row[1].strip()
+        return
+
+    with open_text(source_path, 'r') as fsrc, \
+            open_text(target_path, 'r') as ftgt:
+        for line_number, (source, target) in enumerate(zip_longest(fsrc, ftgt), 1):
+            if source is None or target is None:
+                raise ValueError(f"{source_path} and {target_path} have different line counts "
+                                 f"(diverging at line {line_number})")
+            if source.strip() and target.strip():
+                yield source.strip(), target.strip()
+
+def _insert_placeholders(target: str, replacements: Dict[str, str]) -> str:
+    """Replace term translations in a human target with their placeholders."""
+    for placeholder, translation in replacements.items():
+        pattern = re.compile(r'(?<!\w)' + re.escape(translation) + r'(?!\w)', re.IGNORECASE)
+        matches = list(pattern.finditer(target))
+        if len(matches) == 1:
+            match = matches[0]
+            target = target[:match.start()] + placeholder + target[match.end():]
+    return target
+
+def import_parallel_corpus(memory: TranslationMemory, terminology_manager,
+                           source_path: str, target_path: str = None,
+                           batch_size: int = 1000) -> Dict[str, int]:
+    """
+    Load approved translation pairs into a translation memory.
+
+    Args:
+        memory: TranslationMemory to fill
+        terminology_manager: TerminologyManager with the glossary used for
+            live translation, so entries are keyed like live lookups
+        source_path: Source file, or TSV file of source<TAB>target
+        target_path: Target file aligned with source_path (optional)
+        batch_size: Pairs processed between progress reports
+
+    Returns:
+        Dictionary with 'pairs', 'with_placeholders' and 'entries' counts
+    """
+    stats = {'pairs': 0, 'with_placeholders': 0}
+    pairs = iter_parallel_corpus(source_path, target_path)
+
+    while True:
+        batch = list(islice(pairs, batch_size))
+        if not batch:
+            break
+        for source, target in batch:
+            preprocessed, replacements, _ = terminology_manager.preprocess_text(source)
+            stored = _insert_placeholders(target, replacements) if replacements else target
+            if stored != target:
+                stats['with_placeholders'] += 1
+            memory.add(source, preprocessed, stored)
+        stats['pairs'] += len(batch)
+        logger.info(f"📥 Imported {stats['pairs']} pairs")
+
+    stats['entries'] = len(memory)
+    return stats
+
+def export_parallel_corpus(memory: TranslationMemory, terminology_manager,
+                           source_path: str, target_path: str = None) -> int:
+    """
+    Write translation memory entries as aligned files or a TSV file.
+
+    Placeholders in stored translations are restored by preprocessing the
+    source again with the glossary, so the output is plain text.
+
+    Args:
+        memory: TranslationMemory to export
+        terminology_manager: TerminologyManager used to restore term translations
+        source_path: Source output file, or TSV output if target_path is not given
+        target_path: Target output file (optional)
+
+    Returns:
+        Number of pairs written
+    """
+    fsrc = open_text(source_path, 'w', newline='')
+    ftgt = open_text(target_path, 'w') if target_path else None
+    count = 0
+    try:
+        writer = None if ftgt else csv.writer(fsrc, lineterminator='\n', **_TSV_FORMAT)
+        for entry in memory.iter_entries():
+            source, translation = entry['source'], entry['translation']
+            if '<' in translation:
+                _, replacements, original_cases = terminology_manager.preprocess_text(source)
+                if replacements:
+                    translation = terminology_manager.postprocess_text(translation, replacements, original_cases)
+            source, translation = ' '.join(source.split()), ' '.join(translation.split())
+            if ftgt:
+                fsrc.write(source + '\n')
+                ftgt.write(translation + '\n')
+            else:
+                writer.writerow([source, translation])
+            count += 1
+    finally:
+        fsrc.close()
+        if ftgt:
+            ftgt.close()
+    return count
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Import parallel corpora into, or export them from, a Nkrane-GT translation memory'
+    )
+    parser.add_argument('command', choices=['import', 'export'])
+    parser.add_argument('memory', help='Translation memory file (JSONL); created on import if missing')
+    parser.add_argument('source', help='Source file, or TSV file of source<TAB>target')
+    parser.add_argument('target', nargs='?', help='Target file aligned with the source file (optional)')
+    parser.add_argument('-s', '--source-lang', default='en', help='Source language code (default: en)')
+    parser.add_argument('-t', '--target-lang', required=True, help='Target language code')
+    parser.add_argument('-c', '--csv', '--terminology', dest='terminology',
+                        help='Terminology CSV used for live translation (optional)')
+    parser.add_argument('--batch-size', type=int, default=1000, help='Pairs per batch (default: 1000)')
+    args = parser.parse_args()
+
+    from .terminology_manager import TerminologyManager
+
+    logging.basicConfig(level=logging.INFO)
+    manager = TerminologyManager(target_lang=args.target_lang, user_csv_path=args.terminology)
+    memory = TranslationMemory(src_lang=args.source_lang, target_lang=args.target_lang)
+
+    try:
+        if os.path.exists(args.memory):
+            memory.load(args.memory)
+
+        if args.command == 'import':
+            stats = import_parallel_corpus(memory, manager, args.source, args.target,
+                                           batch_size=args.batch_size)
+            memory.save(args.memory)
+            print(f"✅ Imported {stats['pairs']} pairs ({stats['with_placeholders']} with term placeholders); "
+                  f"{stats['entries']} entries in {args.memory}")
+        else:
+            count = export_parallel_corpus(memory, manager, args.source, args.target)
+            print(f"✅ Exported {count} pairs from {args.memory}")
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,313 @@
+# nkrane_gt/daemon.py
+"""
+Warm translation daemon reached over a Unix domain socket.
+
+Starting a CLI process costs seconds: importing spaCy, loading
+en_core_web_sm and reading the glossary. The daemon keeps translators
+loaded, keyed by language pair and glossary (path and modification time,
+so an edited glossary is reloaded), and serves translation requests from
+the CLI over a local socket.
+
+Protocol: the client sends one JSON object per line and reads one JSON
+object back per line.
+
+    {"op": "translate", "texts": [...], "target": "ak", "source": "en",
+     "terminology": "/abs/path.csv", "priority": "interactive"}
+    -> {"ok": true, "results": [{...}, ...]}
+
+"priority" is the scheduling class ('interactive' or 'bulk'); without it, a
+single text is interactive and anything longer is bulk, as in-process
+translate() and batch_translate() would run them.
+
+Other ops: "ping", "stats" and "shutdown". Failures are returned as
+{"ok": false, "error": "..."}.
+
+The client half of this module only uses the standard library, so the CLI
+can forward requests without importing spaCy. It only talks to a socket
+owned by the current user, so another local user cannot plant a socket at
+the default path and intercept texts.
+"""
+
+import argparse
+import json
+import logging
+import os
+import socket
+import struct
+import sys
+import threading
+from typing import Any, Dict, List, Optional
+
+from .scheduler import PRIORITY_BULK, PRIORITY_CLASSES, PRIORITY_INTERACTIVE
+
+logger = logging.getLogger(__name__)
+
+def default_socket_path() -> str:
+    """Socket path from $NKRANE_SOCKET, $XDG_RUNTIME_DIR or a per-user /tmp path."""
+    if os.environ.get('NKRANE_SOCKET'):
+        return os.environ['NKRANE_SOCKET']
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, 'nkrane_gt.sock')
+    uid = os.getuid() if hasattr(os, 'getuid') else 'user'
+    return os.path.join('/tmp', f'nkrane_gt-{uid}.sock')
+
+def _glossary_key(terminology: Optional[str]):
+    """Absolute glossary path plus mtime, so edits invalidate the cached translator."""
+    if not terminology:
+        return None, None
+    path = os.path.abspath(terminology)
+    try:
+        return path, os.path.getmtime(path)
+    except OSError:
+        return path, None
+
+# ---------------------------------------------------------------------------
+# Client
+# ---------------------------------------------------------------------------
+
+class DaemonClient:
+    def __init__(self, socket_path: str = None, connect_timeout: float = 0.5):
+        """
+        Initialize the daemon client.
+
+        Args:
+            socket_path: Daemon socket (default: default_socket_path())
+            connect_timeout: Seconds to wait for the connection before giving up
+        """
+        self.socket_path = socket_path or default_socket_path()
+        self.connect_timeout = connect_timeout
+
+    def is_available(self) -> bool:
+        """Whether a daemon is answering on the socket."""
+        try:
+            return bool(self.request({'op': 'ping'}).get('ok'))
+        except OSError:
+            return False
+
+    def request(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Send one request and return the decoded response.
+
+        Raises:
+            OSError: If the daemon cannot be reached, or the socket or the
+                process behind it belongs to another user
+        """
+        if not hasattr(socket, 'AF_UNIX') or not os.path.exists(self.socket_path):
+            raise ConnectionRefusedError(f"No daemon socket at {self.socket_path}")
+        self._check_owner(os.stat(self.socket_path).st_uid, 'socket')
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.connect_timeout)
+            sock.connect(self.socket_path)
+            if hasattr(socket, 'SO_PEERCRED'):
+                # The path could have been swapped between stat() and connect()
+                creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize('3i'))
+                self._check_owner(struct.unpack('3i', creds)[1], 'daemon process')
+            # Translation can take as long as the upstream needs
+            sock.settimeout(None)
+            sock.sendall(json.dumps(message, ensure_ascii=False).encode('utf-8') + b'\n')
+            with sock.makefile('rb') as f:
+                line = f.readline()
+        if not line:
+            raise ConnectionResetError("Daemon closed the connection without a response")
+        return json.loads(line.decode('utf-8'))
+
+    def _check_owner(self, uid: int, what: str):
+        """Refuse sockets and peers that belong to another user."""
+        if hasattr(os, 'getuid') and uid != os.getuid():
+            logger.warning(f"⚠️  Ignoring {self.socket_path}: {what} is owned by uid {uid}, not {os.getuid()}")
+            raise PermissionError(f"{what.capitalize()} at {self.socket_path} belongs to another user")
+
+    def translate(self, texts: List[str], target_lang: str, src_lang: str = 'en',
+                  terminology_source: str = None,
+                  priority: str = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Translate texts through the daemon.
+
+        Args:
+            texts: Texts to translate
+            target_lang: Target language code
+            src_lang: Source language code (default: 'en')
+            terminology_source: Path to terminology CSV file (optional)
+            priority: 'interactive' (fails fast while the upstream circuit is
+                open) or 'bulk'; by default interactive for a single text
+
+        Returns:
+            List of result dictionaries (as from batch_translate), or None if
+            no daemon is reachable so the caller can fall back to in-process
+            translation
+
+        Raises:
+            Exception: If the daemon was reached but the request failed
+        """
+        try:
+            response = self.request({
+                'op': 'translate',
+                'texts': list(texts),
+                'target': target_lang,
+                'source': src_lang,
+                'terminology': os.path.abspath(terminology_source) if terminology_source else None,
+                'priority': priority,
+            })
+        except OSError:
+            return None
+
+        if not response.get('ok'):
+            raise Exception(f"Daemon error: {response.get('error')}")
+        return response['results']
+
+# ---------------------------------------------------------------------------
+# Server
+# ---------------------------------------------------------------------------
+
+class TranslationDaemon:
+    def __init__(self, socket_path: str = None, max_translators: int = 8):
+        """
+        Initialize the daemon.
+
+        Args:
+            socket_path: Socket to listen on (default: default_socket_path())
+            max_translators: Warm translators kept; least recently used are dropped
+        """
+        self.socket_path = socket_path or default_socket_path()
+        self.max_translators = max_translators
+        # (source, target, glossary path, mtime) -> (NkraneTranslator, lock)
+        self.translators = {}
+        self.requests_served = 0
+        self._lock = threading.Lock()
+        self._loading = {}  # key -> lock held while that translator loads
+        self._server = None
+
+    def get_translator(self, source: str, target: str, terminology: Optional[str]):
+        """
+        Return a warm translator and the lock serializing its use, loading it on first use.
+        """
+        from .translator import NkraneTranslator
+
+        key = (source, target) + _glossary_key(terminology)
+        with self._lock:
+            entry = self.translators.pop(key, None)
+            if entry is not None:
+                # Re-insert to mark as most recently used
+                self.translators[key] = entry
+                return entry
+            load_lock = self._loading.setdefault(key, threading.Lock())
+
+        # Loading takes seconds; other requests (and ping/stats) must not wait for it
+        with load_lock:
+            with self._lock:
+                entry = self.translators.get(key)
+            if entry is None:
+                logger.info(f"📚 Loading translator {source} → {target} ({terminology or 'no glossary'})")
+                translator = NkraneTranslator(target_lang=target, src_lang=source,
+                                              terminology_source=terminology)
+                entry = (translator, threading.Lock())
+
+            with self._lock:
+                self.translators.pop(key, None)
+                self.translators[key] = entry
+                self._loading.pop(key, None)
+                while len(self.translators) > self.max_translators:
+                    self.translators.pop(next(iter(self.translators)))
+            return entry
+
+    def handle(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Process one decoded request."""
+        op = message.get('op')
+        if op == 'ping':
+            return {'ok': True}
+        if op == 'stats':
+            with self._lock:
+                loaded = [{'source': k[0], 'target': k[1], 'terminology': k[2]} for k in self.translators]
+            return {'ok': True, 'translators': loaded, 'requests_served': self.requests_served}
+        if op == 'shutdown':
+            threading.Thread(target=self._server.shutdown, daemon=True).start()
+            return {'ok': True}
+        if op == 'translate':
+            texts = message.get('texts') or []
+            priority = message.get('priority') or \
+                (PRIORITY_INTERACTIVE if len(texts) == 1 else PRIORITY_BULK)
+            if priority not in PRIORITY_CLASSES:
+                return {'ok': False, 'error': f"Unknown priority class: {priority}"}
+            translator, lock = self.get_translator(
+                message.get('source') or 'en', message['target'], message.get('terminology')
+            )
+            # One spaCy pipeline per translator, so its requests run one at a time
+            with lock:
+                results = translator.batch_translate(texts, priority=priority)
+            self.requests_served += 1
+            return {'ok': True, 'results': results}
+        return {'ok': False, 'error': f"Unknown op: {op}"}
+
+    def serve_forever(self):
+        """Listen on the socket until a shutdown request or interrupt."""
+        import socketserver
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    if not line.strip():
+                        continue
+                    try:
+                        response = daemon.handle(json.loads(line.decode('utf-8')))
+                    except Exception as e:
+                        logger.error(f"❌ Daemon request failed: {e}")
+                        response = {'ok': False, 'error': str(e)}
+                    self.wfile.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+                    self.wfile.flush()
+
+        if os.path.exists(self.socket_path):
+            if DaemonClient(self.socket_path).is_available():
+                raise RuntimeError(f"A daemon is already running on {self.socket_path}")
+            os.unlink(self.socket_path)  # stale socket from a crashed daemon
+
+        old_umask = os.umask(0o177)  # socket readable/writable by this user only
+        try:
+            self._server = socketserver.ThreadingUnixStreamServer(self.socket_path, Handler)
+        finally:
+            os.umask(old_umask)
+        self._server.daemon_threads = True
+
+        logger.info(f"🚀 Nkrane daemon listening on {self.socket_path}")
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            logger.info("👋 Nkrane daemon stopped")
+
+def main():
+    parser = argparse.ArgumentParser(description='Nkrane-GT warm translation daemon')
+    parser.add_argument('command', nargs='?', default='start', choices=['start', 'stop', 'status'],
+                        help='start (default), stop or status')
+    parser.add_argument('--socket', help='Socket path (default: $NKRANE_SOCKET or a per-user path)')
+    parser.add_argument('--max-translators', type=int, default=8,
+                        help='Warm translators to keep loaded (default: 8)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    client = DaemonClient(args.socket)
+
+    if args.command == 'start':
+        TranslationDaemon(args.socket, max_translators=args.max_translators).serve_forever()
+        return
+
+    try:
+        response = client.request({'op': 'shutdown' if args.command == 'stop' else 'stats'})
+    except OSError:
+        print(f"ℹ️  No daemon running on {client.socket_path}")
+        sys.exit(1)
+
+    if args.command == 'stop':
+        print("✅ Daemon stopped")
+    else:
+        print(f"✅ Daemon running on {client.socket_path}, {response['requests_served']} requests served")
+        for entry in response['translators']:
+            print(f"   {entry['source']} → {entry['target']} ({entry['terminology'] or 'no glossary'})")
+
+if __name__ == '__main__':
+    main()
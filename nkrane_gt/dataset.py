@@ -0,0 +1,239 @@
+# nkrane_gt/dataset.py
+"""
+Column translation for tabular datasets (CSV/TSV, JSONL, Parquet).
+
+Rows are read in chunks. For each chunk, the non-empty cells of the
+selected columns are deduplicated and translated, then the translations are
+written to new columns next to the originals before the next chunk is read.
+Memory use is bounded by the chunk size rather than the dataset size.
+CSV/TSV and JSONL files may be gzip, zstd or xz compressed.
+"""
+
+import csv
+import json
+import logging
+import os
+from collections import OrderedDict
+from itertools import islice
+from typing import Dict, Iterator, List, Sequence
+
+from .compression import open_text, strip_compression_suffix
+
+logger = logging.getLogger(__name__)
+
+DATASET_FORMATS = {
+    '.csv': 'csv',
+    '.tsv': 'tsv',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+    '.parquet': 'parquet',
+}
+
+def detect_dataset_format(path: str) -> str:
+    """Infer the dataset format from a file extension, ignoring .gz/.zst/.xz."""
+    ext = os.path.splitext(strip_compression_suffix(path))[1].lower()
+    if ext not in DATASET_FORMATS:
+        raise ValueError(f"Cannot infer dataset format from '{path}' "
+                         f"(supported: {', '.join(sorted(DATASET_FORMATS))})")
+    return DATASET_FORMATS[ext]
+
+def _chunks(iterable, size: int) -> Iterator[List]:
+    """Yield successive lists of at most size items."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+class _ChunkTranslator:
+    """Translate deduplicated cells, remembering recent translations across chunks."""
+
+    def __init__(self, translator, cache_size: int):
+        self.translator = translator
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.stats = {'rows': 0, 'cells': 0, 'translated': 0, 'reused': 0, 'errors': 0}
+
+    def translate_cells(self, cells: Sequence[str]) -> Dict[str, str]:
+        """Return a mapping from each non-empty cell text to its translation."""
+        unique = []
+        mapping = {}
+        for cell in cells:
+            if not cell or not cell.strip():
+                continue
+            self.stats['cells'] += 1
+            if cell in mapping:
+                self.stats['reused'] += 1
+            elif cell in self.cache:
+                self.cache.move_to_end(cell)
+                mapping[cell] = self.cache[cell]
+                self.stats['reused'] += 1
+            else:
+                mapping[cell] = None
+                unique.append(cell)
+
+        if unique:
+            results = self.translator.batch_translate(unique, compact=True)
+            for cell, result in zip(unique, results):
+                if 'error' in result:
+                    mapping[cell] = f"[ERROR] {result['error']}"
+                    self.stats['errors'] += 1
+                    continue
+                mapping[cell] = result['text']
+                self.stats['translated'] += 1
+                if self.cache_size:
+                    self.cache[cell] = result['text']
+                    if len(self.cache) > self.cache_size:
+                        self.cache.popitem(last=False)
+
+        return mapping
+
+def translate_dataset(translator, input_path: str, output_path: str,
+                      columns: Sequence[str], suffix: str = '_translated',
+                      chunk_size: int = 1000, cache_size: int = 10000,
+                      input_format: str = None, compression: str = None) -> Dict[str, int]:
+    """
+    Translate selected text columns of a dataset chunk by chunk.
+
+    Each translated column is written as '<column><suffix>' directly after
+    its source column. Empty cells stay empty. Repeated cells are
+    translated once per chunk, and recent translations are reused across
+    chunks (up to cache_size distinct texts).
+
+    Args:
+        translator: NkraneTranslator used for the translations
+        input_path: Input dataset (.csv, .tsv, .jsonl or .parquet)
+        output_path: Output dataset, in the same format as the input
+        columns: Names of the columns to translate
+        suffix: Suffix for the translated column names
+        chunk_size: Rows per chunk
+        cache_size: Distinct cell translations remembered across chunks
+        input_format: Override the format inferred from the extension
+        compression: Output compression ('gzip', 'zstd', 'xz' or 'none');
+            by default taken from the output extension. Compressed input is
+            detected automatically
+
+    Returns:
+        Dictionary with row, cell, translation, reuse and error counts
+    """
+    if not columns:
+        raise ValueError("At least one column to translate is required")
+
+    input_format = input_format or detect_dataset_format(input_path)
+    chunk_translator = _ChunkTranslator(translator, cache_size)
+
+    if input_format in ('csv', 'tsv'):
+        _translate_csv(chunk_translator, input_path, output_path, columns, suffix,
+                       chunk_size, '\t' if input_format == 'tsv' else ',', compression)
+    elif input_format == 'jsonl':
+        _translate_jsonl(chunk_translator, input_path, output_path, columns, suffix, chunk_size,
+                         compression)
+    elif input_format == 'parquet':
+        if compression not in (None, 'none') or strip_compression_suffix(output_path) != output_path:
+            raise ValueError("Parquet output is compressed internally; drop the .gz/.zst/.xz compression")
+        _translate_parquet(chunk_translator, input_path, output_path, columns, suffix, chunk_size)
+    else:
+        raise ValueError(f"Unsupported dataset format: {input_format}")
+
+    return chunk_translator.stats
+
+def _output_fieldnames(fieldnames: Sequence[str], columns: Sequence[str], suffix: str) -> List[str]:
+    """Insert each translated column right after its source column."""
+    missing = [col for col in columns if col not in fieldnames]
+    if missing:
+        raise ValueError(f"Column(s) not found in dataset: {', '.join(missing)}")
+
+    output = []
+    for name in fieldnames:
+        output.append(name)
+        if name in columns:
+            output.append(name + suffix)
+    return output
+
+def _translate_rows(chunk_translator: _ChunkTranslator, rows: List[Dict],
+                    columns: Sequence[str], suffix: str):
+    """Add translated columns to a chunk of row dictionaries in place."""
+    mapping = chunk_translator.translate_cells(
+        [row.get(col) for row in rows for col in columns if isinstance(row.get(col), str)]
+    )
+    for row in rows:
+        for col in columns:
+            value = row.get(col)
+            row[col + suffix] = mapping.get(value, '') if isinstance(value, str) else value
+    chunk_translator.stats['rows'] += len(rows)
+
+def _translate_csv(chunk_translator: _ChunkTranslator, input_path: str, output_path: str,
+                   columns: Sequence[str], suffix: str, chunk_size: int, delimiter: str,
+                   compression: str = None):
+    with open_text(input_path, 'r', newline='') as fin, \
+            open_text(output_path, 'w', compression, newline='') as fout:
+        reader = csv.DictReader(fin, delimiter=delimiter)
+        fieldnames = _output_fieldnames(reader.fieldnames or [], columns, suffix)
+        writer = csv.DictWriter(fout, fieldnames=fieldnames, delimiter=delimiter)
+        writer.writeheader()
+
+        for rows in _chunks(reader, chunk_size):
+            _translate_rows(chunk_translator, rows, columns, suffix)
+            writer.writerows(rows)
+
+def _translate_jsonl(chunk_translator: _ChunkTranslator, input_path: str, output_path: str,
+                     columns: Sequence[str], suffix: str, chunk_size: int,
+                     compression: str = None):
+    with open_text(input_path, 'r') as fin, \
+            open_text(output_path, 'w', compression) as fout:
+        records = (json.loads(line) for line in fin if line.strip())
+
+        for rows in _chunks(records, chunk_size):
+            _translate_rows(chunk_translator, rows, columns, suffix)
+            for row in rows:
+                # Rebuild so translated keys sit next to their source keys
+                ordered = {}
+                for key, value in row.items():
+                    if key.endswith(suffix) and key[:-len(suffix)] in columns:
+                        continue
+                    ordered[key] = value
+                    if key in columns:
+                        ordered[key + suffix] = row[key + suffix]
+                fout.write(json.dumps(ordered, ensure_ascii=False))
+                fout.write('\n')
+
+def _translate_parquet(chunk_translator: _ChunkTranslator, input_path: str, output_path: str,
+                       columns: Sequence[str], suffix: str, chunk_size: int):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("pyarrow is required for Parquet datasets: pip install pyarrow")
+
+    source = pq.ParquetFile(input_path)
+    fieldnames = _output_fieldnames(source.schema_arrow.names, columns, suffix)
+    writer = None
+
+    try:
+        for batch in source.iter_batches(batch_size=chunk_size):
+            # Only the text columns are converted to Python objects
+            texts = {col: batch.column(col).to_pylist() for col in columns}
+            mapping = chunk_translator.translate_cells(
+                [value for col in columns for value in texts[col] if isinstance(value, str)]
+            )
+
+            arrays = []
+            for name in fieldnames:
+                if name.endswith(suffix) and name[:-len(suffix)] in columns:
+                    values = texts[name[:-len(suffix)]]
+                    arrays.append(pa.array(
+                        [mapping.get(v, '') if isinstance(v, str) else None for v in values],
+                        type=pa.string()
+                    ))
+                else:
+                    arrays.append(batch.column(name))
+
+            table = pa.Table.from_arrays(arrays, names=fieldnames)
+            if writer is None:
+                writer = pq.ParquetWriter(output_path, table.schema)
+            writer.write_table(table)
+            chunk_translator.stats['rows'] += batch.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
@@ -0,0 +1,312 @@
+# nkrane_gt/governor.py
+"""
+Adaptive concurrency and rate control for upstream translation requests.
+
+One AdaptiveGovernor is shared per language pair. It limits the number of
+requests in flight and the request start rate, and adjusts both with AIMD
+(additive increase, multiplicative decrease) from the outcome of each
+request: successes with acceptable latency raise the limits slowly,
+429/5xx responses, timeouts and connection failures halve them. After
+repeated consecutive failures a circuit breaker opens and rejects requests
+immediately until a cooldown has passed, then lets a single probe through.
+Bulk callers may wait out the cooldowns instead, but only until the outage
+has lasted max_open_wait seconds; after that they fail fast as well.
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Request outcomes reported to AdaptiveGovernor.release()
+OUTCOME_OK = 'ok'
+OUTCOME_THROTTLED = 'throttled'      # HTTP 429 or 5xx
+OUTCOME_TIMEOUT = 'timeout'
+OUTCOME_UNAVAILABLE = 'unavailable'  # connection errors
+OUTCOME_ERROR = 'error'              # anything else; does not affect the limits
+
+OVERLOAD_OUTCOMES = (OUTCOME_THROTTLED, OUTCOME_TIMEOUT, OUTCOME_UNAVAILABLE)
+
+CIRCUIT_CLOSED = 'closed'
+CIRCUIT_OPEN = 'open'
+CIRCUIT_HALF_OPEN = 'half_open'
+
+class CircuitOpenError(Exception):
+    """Raised when the upstream circuit breaker is open."""
+
+class AdaptiveGovernor:
+    def __init__(self, name: str,
+                 initial_concurrency: float = 1.0, min_concurrency: float = 1.0,
+                 max_concurrency: float = 16.0,
+                 initial_rate: float = 2.0, min_rate: float = 0.2, max_rate: float = 50.0,
+                 rate_increase: float = 0.5, decrease_factor: float = 0.5,
+                 latency_target: float = 5.0, failure_threshold: int = 5,
+                 cooldown: float = 30.0, max_cooldown: float = 300.0,
+                 max_open_wait: float = 600.0):
+        """
+        Initialize the governor.
+
+        Args:
+            name: Label used in logs and stats (e.g. 'en->ak')
+            initial_concurrency: Starting in-flight request limit
+            min_concurrency: Lowest in-flight limit after decreases
+            max_concurrency: Highest in-flight limit
+            initial_rate: Starting request rate (requests/second)
+            min_rate: Lowest request rate after decreases
+            max_rate: Highest request rate
+            rate_increase: Rate added per second of successful traffic
+            decrease_factor: Multiplier applied to both limits on overload
+            latency_target: Successes slower than this (seconds) do not raise the limits
+            failure_threshold: Consecutive overload failures that open the circuit
+            cooldown: Initial seconds the circuit stays open
+            max_cooldown: Cap for the cooldown, which doubles on failed probes
+            max_open_wait: Seconds since the circuit first opened after which
+                bulk callers stop waiting for it and get CircuitOpenError
+        """
+        self.name = name
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.rate_increase = rate_increase
+        self.decrease_factor = decrease_factor
+        self.latency_target = latency_target
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.max_open_wait = max_open_wait
+
+        self.concurrency_limit = initial_concurrency
+        self.rate = initial_rate
+        self.in_flight = 0
+        self.next_start = 0.0
+        self.last_decrease = 0.0
+        self.latency_ewma = None
+
+        self.circuit = CIRCUIT_CLOSED
+        self.cooldown = cooldown
+        self.open_until = 0.0
+        self.outage_started = None
+        self.consecutive_failures = 0
+
+        self.counts = {outcome: 0 for outcome in
+                       (OUTCOME_OK, OUTCOME_THROTTLED, OUTCOME_TIMEOUT, OUTCOME_UNAVAILABLE, OUTCOME_ERROR)}
+        self.rejected = 0
+
+        self._cond = threading.Condition()
+
+    def acquire(self, timeout: Optional[float] = None, wait_if_open: bool = False) -> float:
+        """
+        Wait for a request slot.
+
+        Blocks until the in-flight limit and the request rate allow another
+        request to start.
+
+        Args:
+            timeout: Maximum seconds to wait (default: no limit)
+            wait_if_open: Wait out an open circuit's cooldown instead of
+                failing (for bulk work, which would otherwise turn a short
+                outage into errors for every remaining item), as long as the
+                outage has lasted less than max_open_wait
+
+        Returns:
+            Start time to pass back to release()
+
+        Raises:
+            CircuitOpenError: If the circuit is open and wait_if_open is False
+                or the outage has outlasted max_open_wait
+            TimeoutError: If no slot became available within timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                if wait_if_open and self.circuit == CIRCUIT_OPEN and now < self.open_until:
+                    # Sit out the cooldown, then compete for the probe
+                    wait = self._open_wait(now)
+                else:
+                    self._check_circuit(now)
+
+                    if self.in_flight < max(1, int(self.concurrency_limit)):
+                        if self.circuit == CIRCUIT_HALF_OPEN and self.in_flight > 0:
+                            wait = 0.1  # only one probe at a time
+                        else:
+                            wait = self.next_start - now
+                            if wait <= 0:
+                                self.next_start = max(now, self.next_start) + 1.0 / self.rate
+                                self.in_flight += 1
+                                return now
+                    else:
+                        wait = None
+
+                if deadline is not None:
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        raise TimeoutError(f"No upstream slot available for {self.name}")
+                    wait = remaining if wait is None else min(wait, remaining)
+                self._cond.wait(wait)
+
+    def wait_for_circuit(self):
+        """
+        Block until an open circuit's cooldown has passed.
+
+        Returns immediately if the circuit is not open. Afterwards the
+        circuit may be half open, with acquire() letting a single probe through.
+
+        Raises:
+            CircuitOpenError: If the outage has outlasted max_open_wait
+        """
+        with self._cond:
+            while self.circuit == CIRCUIT_OPEN:
+                now = time.monotonic()
+                if now >= self.open_until:
+                    return
+                self._cond.wait(self._open_wait(now))
+
+    def _open_wait(self, now: float) -> float:
+        # Seconds to wait for an open circuit; caller holds the lock
+        give_up = self.outage_started + self.max_open_wait
+        if now >= give_up:
+            self.rejected += 1
+            raise CircuitOpenError(
+                f"Upstream {self.name} unavailable for {now - self.outage_started:.0f}s, "
+                f"not waiting any longer"
+            )
+        return min(self.open_until, give_up) - now
+
+    def release(self, start: float, outcome: str):
+        """
+        Report the outcome of a request started with acquire().
+
+        Args:
+            start: Value returned by acquire()
+            outcome: One of the OUTCOME_* constants
+        """
+        with self._cond:
+            self.in_flight -= 1
+            self._record(start, outcome)
+
+    def report(self, start: float, outcome: str):
+        """
+        Report the outcome of a request sent without acquire() (a hedge).
+
+        Adjusts the limits and circuit like release(), without touching the
+        in-flight count.
+
+        Args:
+            start: time.monotonic() when the request was sent
+            outcome: One of the OUTCOME_* constants
+        """
+        with self._cond:
+            self._record(start, outcome)
+
+    def _record(self, start: float, outcome: str):
+        # Caller holds the lock
+        now = time.monotonic()
+        latency = now - start
+
+        self.counts[outcome] = self.counts.get(outcome, 0) + 1
+
+        if outcome == OUTCOME_OK:
+            self.latency_ewma = latency if self.latency_ewma is None else \
+                0.8 * self.latency_ewma + 0.2 * latency
+            self.consecutive_failures = 0
+            if self.circuit != CIRCUIT_CLOSED:
+                logger.info(f"✅ Upstream {self.name} recovered, closing circuit")
+                self.circuit = CIRCUIT_CLOSED
+                self.cooldown = self.base_cooldown
+                self.outage_started = None
+            if latency <= self.latency_target:
+                self._increase()
+
+        elif outcome in OVERLOAD_OUTCOMES:
+            self.consecutive_failures += 1
+            self._decrease(now)
+            if self.circuit == CIRCUIT_HALF_OPEN:
+                self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+                self._open_circuit(now)
+            elif self.consecutive_failures >= self.failure_threshold:
+                self._open_circuit(now)
+
+        self._cond.notify_all()
+
+    def _increase(self):
+        # Additive increase: roughly +1 slot per window of successes and
+        # +rate_increase requests/second per second of traffic
+        self.concurrency_limit = min(self.max_concurrency,
+                                     self.concurrency_limit + 1.0 / self.concurrency_limit)
+        self.rate = min(self.max_rate, self.rate + self.rate_increase / self.rate)
+
+    def _decrease(self, now: float):
+        # Requests that were already in flight report the same congestion,
+        # so decrease at most once per current request interval
+        if now - self.last_decrease < max(1.0 / self.rate, self.latency_ewma or 0.0):
+            return
+        self.last_decrease = now
+        self.concurrency_limit = max(self.min_concurrency, self.concurrency_limit * self.decrease_factor)
+        self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+        self.next_start = max(self.next_start, now + 1.0 / self.rate)
+        logger.warning(f"⚠️  Upstream {self.name} overloaded, backing off to "
+                       f"{self.rate:.2f} req/s, {self.concurrency_limit:.1f} in flight")
+
+    def _open_circuit(self, now: float):
+        self.circuit = CIRCUIT_OPEN
+        self.open_until = now + self.cooldown
+        if self.outage_started is None:
+            self.outage_started = now
+        logger.warning(f"⚠️  Upstream {self.name} failing, pausing requests for {self.cooldown:.0f}s")
+
+    def _check_circuit(self, now: float):
+        if self.circuit == CIRCUIT_OPEN:
+            if now < self.open_until:
+                self.rejected += 1
+                raise CircuitOpenError(
+                    f"Upstream {self.name} circuit open for another {self.open_until - now:.1f}s"
+                )
+            self.circuit = CIRCUIT_HALF_OPEN
+
+    def snapshot(self) -> Dict:
+        """Current limits, backoff state and outcome counts."""
+        with self._cond:
+            now = time.monotonic()
+            return {
+                'name': self.name,
+                'concurrency_limit': round(self.concurrency_limit, 2),
+                'in_flight': self.in_flight,
+                'rate': round(self.rate, 3),
+                'latency_ewma': None if self.latency_ewma is None else round(self.latency_ewma, 3),
+                'circuit': self.circuit,
+                'circuit_open_for': round(max(0.0, self.open_until - now), 1) if self.circuit == CIRCUIT_OPEN else 0.0,
+                'cooldown': self.cooldown,
+                'outage_for': 0.0 if self.outage_started is None else round(now - self.outage_started, 1),
+                'consecutive_failures': self.consecutive_failures,
+                'outcomes': dict(self.counts),
+                'rejected': self.rejected,
+            }
+
+# Governors shared by all translators in this process, keyed by language pair
+_governors = {}
+_governors_lock = threading.Lock()
+
+def get_governor(src_lang: str, target_lang: str, **kwargs) -> AdaptiveGovernor:
+    """
+    Return the process-wide governor for a language pair, creating it if needed.
+
+    Keyword arguments are passed to AdaptiveGovernor on creation only.
+    """
+    key = (src_lang, target_lang)
+    with _governors_lock:
+        governor = _governors.get(key)
+        if governor is None:
+            governor = AdaptiveGovernor(f"{src_lang}->{target_lang}", **kwargs)
+            _governors[key] = governor
+        return governor
+
+def governor_stats() -> Dict[str, Dict]:
+    """Snapshots of every governor in this process."""
+    with _governors_lock:
+        governors = list(_governors.values())
+    return {governor.name: governor.snapshot() for governor in governors}
@@ -0,0 +1,157 @@
+# nkrane_gt/hedging.py
+"""
+Hedged upstream requests.
+
+A few upstream calls hang for many seconds while most answer quickly, and
+those stragglers dominate tail latency. With hedging, a request that has
+not answered within a high percentile of recently observed latencies gets a
+duplicate, and whichever answers first is used. A hedging budget (a token
+bucket refilled by a fraction of all requests) bounds the extra load, so
+hedges stay a small share of traffic even when the upstream slows down
+across the board.
+
+The delay is measured from when a request actually goes on the wire (after
+any wait for the governor), and the history holds only HTTP round-trip
+times, so time spent queueing never triggers a hedge. The slower of the
+two requests cannot be cancelled and finishes in the background; its
+latency still feeds the history. All hedgers share one thread pool.
+"""
+
+import logging
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Threads running primary and hedge requests, shared by all hedgers
+_EXECUTOR_WORKERS = 64
+_executor = None
+_executor_lock = threading.Lock()
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=_EXECUTOR_WORKERS, thread_name_prefix='nkrane-hedge')
+        return _executor
+
+class RequestHedger:
+    def __init__(self, percentile: float = 0.95, budget: float = 0.05,
+                 max_burst: float = 5.0, min_samples: int = 20, window: int = 500,
+                 min_delay: float = 0.05):
+        """
+        Initialize the hedger.
+
+        Args:
+            percentile: Latency percentile of recent requests after which a
+                duplicate is sent (0.95 hedges roughly the slowest 5%)
+            budget: Hedges allowed per request on average
+            max_burst: Hedges that may be saved up and spent at once
+            min_samples: Latencies to observe before hedging starts
+            window: Recent latencies kept
+            min_delay: Lower bound for the hedge delay (seconds)
+        """
+        self.percentile = percentile
+        self.budget = budget
+        self.max_burst = max_burst
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+
+        self.latencies = deque(maxlen=window)
+        self.tokens = 1.0
+        self.stats = {'requests': 0, 'hedged': 0, 'hedge_wins': 0, 'budget_denied': 0}
+
+        self._lock = threading.Lock()
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds after which a request is hedged, or None until enough latencies are known."""
+        with self._lock:
+            if len(self.latencies) < self.min_samples:
+                return None
+            samples = sorted(self.latencies)
+        index = min(len(samples) - 1, int(self.percentile * len(samples)))
+        return max(self.min_delay, samples[index])
+
+    def record(self, latency: float):
+        """Add the round-trip time (seconds) of a request that got an answer."""
+        with self._lock:
+            self.latencies.append(latency)
+
+    def _take_token(self) -> bool:
+        with self._lock:
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                self.stats['hedged'] += 1
+                return True
+            self.stats['budget_denied'] += 1
+            return False
+
+    def call(self, primary: Callable[[Callable[[], None]], str],
+             hedge: Callable[[Callable[[], None]], str] = None,
+             allow: Callable[[], bool] = None) -> str:
+        """
+        Run a request, hedging it if it is slow.
+
+        Args:
+            primary: Sends the request and returns the translation; calls the
+                function it is given right before the request goes out
+            hedge: Sends the duplicate request, same signature (default: primary)
+            allow: Checked before hedging; returning False skips the hedge
+                (e.g. while the upstream is known to be overloaded)
+
+        Returns:
+            The first successful result
+
+        Raises:
+            Exception: The last error if both requests failed
+        """
+        delay = self.hedge_delay()
+        with self._lock:
+            self.stats['requests'] += 1
+            self.tokens = min(self.max_burst, self.tokens + self.budget)
+
+        executor = _get_executor()
+        sent = threading.Event()
+        first = executor.submit(primary, sent.set)
+        if delay is None:
+            return first.result()
+
+        # The delay starts once the primary is on the wire, not while it queues
+        while not sent.wait(0.05):
+            if first.done():
+                return first.result()
+        done, _ = wait([first], timeout=delay)
+        if done or (allow is not None and not allow()) or not self._take_token():
+            return first.result()
+
+        logger.debug(f"Hedging upstream request after {delay:.2f}s")
+        second = executor.submit(hedge or primary, lambda: None)
+        pending = {first, second}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is second:
+                        with self._lock:
+                            self.stats['hedge_wins'] += 1
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def snapshot(self) -> Dict:
+        """Hedge rate, hedge wins, budget denials and the current hedge delay."""
+        delay = self.hedge_delay()
+        with self._lock:
+            stats = dict(self.stats)
+            samples = sorted(self.latencies)
+        requests = stats['requests']
+        stats['hedge_rate'] = round(stats['hedged'] / requests, 4) if requests else 0.0
+        stats['hedge_win_rate'] = round(stats['hedge_wins'] / stats['hedged'], 4) if stats['hedged'] else 0.0
+        stats['hedge_delay'] = None if delay is None else round(delay, 3)
+        stats['latency_p50'] = round(samples[len(samples) // 2], 3) if samples else None
+        stats['latency_p99'] = round(samples[min(len(samples) - 1, int(0.99 * len(samples)))], 3) \
+            if samples else None
+        return stats
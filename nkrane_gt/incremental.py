@@ -0,0 +1,154 @@
+# nkrane_gt/incremental.py
+"""
+Incremental re-translation of revised documents.
+
+Given the previous source lines and their translations, only the lines and
+sentences that changed are sent for translation; unchanged ones reuse the
+previous translation in place. Lines are diffed first. For a line that
+was edited, its sentences are diffed against the old line's sentences, and
+old translations are reused sentence by sentence when the old translation
+has the same number of sentences as its source (so the alignment is
+unambiguous); otherwise the whole line is re-translated. Previous
+translations that are empty or '[ERROR] ...' lines are never reused.
+"""
+
+import difflib
+import logging
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .result import TranslationResult
+from .scheduler import PRIORITY_BULK
+
+logger = logging.getLogger(__name__)
+
+REUSED = 'previous'  # memory_match value for reused translations
+
+ERROR_PREFIX = '[ERROR]'  # how failed lines are written to output files
+
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+
+def _is_reusable(translation: str) -> bool:
+    """Previous output lines that failed or are empty are translated again."""
+    translation = translation.strip()
+    return bool(translation) and not translation.startswith(ERROR_PREFIX)
+
+def split_sentences(text: str) -> List[str]:
+    """Split a line into sentences on terminal punctuation."""
+    return [s for s in _SENTENCE_SPLIT_RE.split(text.strip()) if s]
+
+def incremental_translate(translator, texts: Sequence[str],
+                          previous_texts: Sequence[str],
+                          previous_translations: Sequence[str],
+                          compact: bool = False, verbose: bool = False) -> Tuple[list, Dict[str, int]]:
+    """
+    Translate a revised document, reusing the previous translation where possible.
+
+    Args:
+        translator: NkraneTranslator used for changed segments
+        texts: New source lines
+        previous_texts: Previous source lines
+        previous_translations: Translations of previous_texts, line for line
+        compact: Return TranslationResult objects instead of dicts
+        verbose: With compact=True, keep the verbose result fields
+
+    Returns:
+        Tuple of (results, stats). results has one entry per line of texts,
+        in the same format as batch_translate; reused lines have
+        memory_match 'previous'. stats counts reused and translated lines
+        and sentences.
+    """
+    if len(previous_texts) != len(previous_translations):
+        raise ValueError(f"Previous source has {len(previous_texts)} lines but previous "
+                         f"translation has {len(previous_translations)}")
+
+    stats = {'lines': len(texts), 'lines_reused': 0, 'lines_translated': 0,
+             'sentences_reused': 0, 'sentences_translated': 0, 'errors': 0}
+    results: List[Optional[TranslationResult]] = [None] * len(texts)
+    keep = verbose or not compact
+
+    matcher = difflib.SequenceMatcher(a=list(previous_texts), b=list(texts), autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            for i, j in zip(range(i1, i2), range(j1, j2)):
+                if _is_reusable(previous_translations[i]):
+                    results[j] = _reused(translator, texts[j], previous_translations[i], keep)
+                    stats['lines_reused'] += 1
+                else:
+                    results[j] = _translate(translator, texts[j], stats, keep)
+                    stats['sentences_translated'] += len(split_sentences(texts[j])) or 1
+                    stats['lines_translated'] += 1
+            continue
+
+        # Pair edited lines with the old lines they replaced, in order
+        old_indices = list(range(i1, i2)) if tag == 'replace' else []
+        for offset, j in enumerate(range(j1, j2)):
+            old = old_indices[offset] if offset < len(old_indices) else None
+            if old is None:
+                results[j] = _translate(translator, texts[j], stats, keep)
+                stats['sentences_translated'] += len(split_sentences(texts[j])) or 1
+            else:
+                results[j] = _translate_edited_line(
+                    translator, texts[j], previous_texts[old], previous_translations[old], stats, keep
+                )
+            stats['lines_translated'] += 1
+
+    logger.info(f"♻️  Reused {stats['lines_reused']}/{stats['lines']} lines and "
+                f"{stats['sentences_reused']} sentences; translated {stats['sentences_translated']} sentences")
+
+    return [r if compact else r.to_dict() for r in results], stats
+
+def _reused(translator, text: str, translation: str, keep: bool) -> TranslationResult:
+    return TranslationResult(
+        text=translation,
+        src=translator.src_lang,
+        dest=translator.target_lang,
+        memory_match=REUSED,
+        original=text if keep else None
+    )
+
+def _translate(translator, text: str, stats: Dict[str, int], keep: bool) -> TranslationResult:
+    try:
+        return translator.translate(text, compact=True, verbose=keep, priority=PRIORITY_BULK)
+    except Exception as e:
+        logger.error(f"❌ Failed to translate segment: {e}")
+        stats['errors'] += 1
+        return TranslationResult(text='', error=str(e), original=text)
+
+def _translate_edited_line(translator, text: str, old_text: str, old_translation: str,
+                           stats: Dict[str, int], keep: bool) -> TranslationResult:
+    """Re-translate only the changed sentences of an edited line."""
+    new_sentences = split_sentences(text)
+    old_sentences = split_sentences(old_text)
+    old_targets = split_sentences(old_translation)
+
+    if len(old_sentences) != len(old_targets) or len(new_sentences) <= 1 or \
+            not _is_reusable(old_translation):
+        stats['sentences_translated'] += len(new_sentences) or 1
+        return _translate(translator, text, stats, keep)
+
+    parts: List[Optional[str]] = [None] * len(new_sentences)
+    replacements_count = 0
+
+    matcher = difflib.SequenceMatcher(a=old_sentences, b=new_sentences, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            for i, j in zip(range(i1, i2), range(j1, j2)):
+                parts[j] = old_targets[i]
+                stats['sentences_reused'] += 1
+            continue
+        for j in range(j1, j2):
+            result = _translate(translator, new_sentences[j], stats, keep=False)
+            if result.error is not None:
+                return TranslationResult(text='', error=result.error, original=text)
+            parts[j] = result.text
+            replacements_count += result.replacements_count
+            stats['sentences_translated'] += 1
+
+    return TranslationResult(
+        text=' '.join(parts),
+        src=translator.src_lang,
+        dest=translator.target_lang,
+        replacements_count=replacements_count,
+        original=text if keep else None
+    )
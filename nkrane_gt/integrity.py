@@ -0,0 +1,166 @@
+# nkrane_gt/integrity.py
+"""
+Placeholder integrity check with sentence-level retry.
+
+The upstream translation sometimes drops a <n> placeholder, repeats it or
+mangles it ('< 0 >', '&lt;0&gt;', '＜0＞'), and postprocess_text then
+silently leaves the term untranslated. After each upstream call the
+translation is split into sentences and aligned with the sentences of the
+preprocessed text (when both have the same number of sentences; otherwise
+the whole text is one unit). Each sentence must contain each of its own
+placeholders exactly once. Broken sentences alone are re-requested with the
+placeholders spelled in an alternative encoding ('[0]', '{0}', ...), decoded
+back to <n> and spliced into the translation, so retry cost grows with the
+number of broken sentences rather than with document length.
+"""
+
+import logging
+import re
+import threading
+from typing import Callable, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+ISSUE_MISSING = 'missing'
+ISSUE_DUPLICATED = 'duplicated'
+ISSUE_ALTERED = 'altered'
+
+# Encodings tried, in order, when a sentence is re-requested
+ALTERNATIVE_ENCODINGS = ('[{}]', '{{{}}}', '__{}__')
+
+_PLACEHOLDER_RE = re.compile(r'<(\d+)>')
+# Placeholders as the upstream tends to mangle them
+_MANGLED_RE = re.compile(r'(?:<|&lt;|＜)\s*(\d+)\s*(?:>|&gt;|＞)')
+# Sentence boundaries, keeping the separating whitespace for splicing
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?。！？])(\s+)')
+
+def find_placeholder_issues(text: str, expected: List[str]) -> Dict[str, str]:
+    """
+    Check that each expected placeholder occurs exactly once in text.
+
+    Args:
+        text: Translated text (or sentence)
+        expected: Placeholders such as '<0>' that text must contain
+
+    Returns:
+        Dictionary of placeholder -> issue ('missing', 'duplicated' or
+        'altered'); empty if the text is intact
+    """
+    issues = {}
+    for placeholder in expected:
+        exact = text.count(placeholder)
+        if exact == 1:
+            continue
+        if exact > 1:
+            issues[placeholder] = ISSUE_DUPLICATED
+            continue
+        number = placeholder[1:-1]
+        mangled = [m for m in _MANGLED_RE.finditer(text) if m.group(1) == number]
+        issues[placeholder] = ISSUE_ALTERED if mangled else ISSUE_MISSING
+    return issues
+
+def _split_sentences(text: str) -> List[str]:
+    """Split text into [sentence, separator, sentence, ...]."""
+    return _SENTENCE_SPLIT_RE.split(text)
+
+class PlaceholderValidator:
+    def __init__(self, max_retries: int = 2):
+        """
+        Initialize the validator.
+
+        Args:
+            max_retries: Re-requests allowed per broken sentence, each with
+                the next alternative placeholder encoding
+        """
+        self.max_retries = max_retries
+        self.stats = {
+            'texts_checked': 0, 'texts_broken': 0,
+            'sentences_broken': 0, 'sentences_repaired': 0, 'sentences_unrepaired': 0,
+            'retry_requests': 0, 'retry_characters': 0,
+            ISSUE_MISSING: 0, ISSUE_DUPLICATED: 0, ISSUE_ALTERED: 0,
+        }
+        self._lock = threading.Lock()
+
+    def _count(self, key: str, amount: int = 1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def verify(self, preprocessed_text: str, translated_text: str,
+               translate_fn: Callable[[str], str]) -> Tuple[str, bool]:
+        """
+        Check a translation's placeholders and repair broken sentences.
+
+        Args:
+            preprocessed_text: Text that was sent upstream, with <n> placeholders
+            translated_text: Upstream translation of preprocessed_text
+            translate_fn: Sends one text upstream and returns its translation
+
+        Returns:
+            Tuple of (translation, intact): the translation with broken
+            sentences replaced by their retried translations where a retry
+            succeeded, and whether every placeholder is now intact
+        """
+        if '<' not in preprocessed_text or not _PLACEHOLDER_RE.search(preprocessed_text):
+            return translated_text, True
+        self._count('texts_checked')
+
+        source_parts = _split_sentences(preprocessed_text)
+        target_parts = _split_sentences(translated_text)
+        if len(source_parts) != len(target_parts):
+            # No unambiguous sentence alignment; check the text as a whole
+            source_parts, target_parts = [preprocessed_text], [translated_text]
+
+        broken = []
+        for i in range(0, len(source_parts), 2):
+            expected = _PLACEHOLDER_RE.findall(source_parts[i])
+            issues = find_placeholder_issues(target_parts[i], [f'<{n}>' for n in expected])
+            if issues:
+                broken.append(i)
+                for issue in issues.values():
+                    self._count(issue)
+
+        if not broken:
+            return translated_text, True
+
+        self._count('texts_broken')
+        self._count('sentences_broken', len(broken))
+        intact = True
+        for i in broken:
+            repaired = self._retry_sentence(source_parts[i], translate_fn)
+            if repaired is None:
+                intact = False
+                self._count('sentences_unrepaired')
+                logger.warning(f"⚠️  Placeholders still broken after {self.max_retries} retries: "
+                               f"{source_parts[i]!r}")
+            else:
+                self._count('sentences_repaired')
+                target_parts[i] = repaired
+
+        return ''.join(target_parts), intact
+
+    def _retry_sentence(self, sentence: str, translate_fn: Callable[[str], str]):
+        """Re-request one sentence with alternative encodings; None if all attempts fail."""
+        numbers = _PLACEHOLDER_RE.findall(sentence)
+        for attempt in range(self.max_retries):
+            encoding = ALTERNATIVE_ENCODINGS[attempt % len(ALTERNATIVE_ENCODINGS)]
+            encoded = _PLACEHOLDER_RE.sub(lambda m: encoding.format(m.group(1)), sentence)
+
+            self._count('retry_requests')
+            self._count('retry_characters', len(encoded))
+            try:
+                translated = translate_fn(encoded)
+            except Exception as e:
+                logger.warning(f"⚠️  Placeholder retry failed: {e}")
+                continue
+
+            if find_placeholder_issues(translated, [encoding.format(n) for n in numbers]):
+                continue
+            for number in numbers:
+                translated = translated.replace(encoding.format(number), f'<{number}>')
+            return translated
+        return None
+
+    def snapshot(self) -> Dict[str, int]:
+        """Counts of checked and broken texts, issues found and retries made."""
+        with self._lock:
+            return dict(self.stats)
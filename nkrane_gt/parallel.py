@@ -0,0 +1,260 @@
+# nkrane_gt/parallel.py
+"""
+Process-pool translation of large files.
+
+spaCy parsing holds the GIL, so a single NkraneTranslator only ever uses one
+core for preprocessing. This module splits an input file into byte-range
+shards aligned on line boundaries and translates each shard in its own
+worker process. Workers memory-map the input and read only their own byte
+range, so no line lists are pickled across processes, and each worker loads
+the spaCy model and glossary once. Shard outputs are written to temporary
+files and concatenated in input order.
+
+Compressed input (gzip, zstd, xz) and pipes cannot be memory-mapped or split
+by byte offset, so they are read as a stream instead and sent to the workers
+in chunks of lines, with a bounded number of chunks in flight; results are
+written in input order as they complete.
+"""
+
+import logging
+import mmap
+import os
+import shutil
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, List, Optional, TextIO, Tuple, Union
+
+from .compression import is_compressed, open_text
+from .scheduler import PRIORITY_BULK
+
+logger = logging.getLogger(__name__)
+
+# Per-process translator, created once by _init_worker
+_worker_translator = None
+
+# Lines per chunk when streaming compressed or piped input
+STREAM_CHUNK_LINES = 256
+
+def compute_shards(path: str, num_shards: int) -> List[Tuple[int, int]]:
+    """
+    Split a file into byte ranges that start and end on line boundaries.
+
+    Args:
+        path: Input file path
+        num_shards: Desired number of shards (fewer are returned for small files)
+
+    Returns:
+        List of (start, end) byte offsets covering the whole file
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+
+    num_shards = max(1, min(num_shards, size))
+    step = size // num_shards
+    shards = []
+
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        start = 0
+        for i in range(1, num_shards):
+            target = max(start, i * step)
+            newline = mm.find(b'\n', target)
+            if newline == -1:
+                break
+            end = newline + 1
+            if end > start:
+                shards.append((start, end))
+                start = end
+            if start >= size:
+                break
+        if start < size:
+            shards.append((start, size))
+
+    return shards
+
+def _init_worker(target_lang: str, src_lang: str, terminology_source: Optional[str]):
+    """Load the spaCy model and glossary once per worker process."""
+    global _worker_translator
+    from .translator import NkraneTranslator
+    _worker_translator = NkraneTranslator(
+        target_lang=target_lang,
+        src_lang=src_lang,
+        terminology_source=terminology_source
+    )
+
+def _translate_shard(path: str, start: int, end: int, out_path: str,
+                     delay: float) -> Dict[str, int]:
+    """Translate the non-empty lines in one byte range of the input file."""
+    lines = 0
+    errors = 0
+
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+            open(out_path, 'w', encoding='utf-8') as out:
+        pos = start
+        while pos < end:
+            newline = mm.find(b'\n', pos, end)
+            line_end = end if newline == -1 else newline + 1
+            text = mm[pos:line_end].decode('utf-8').strip()
+            pos = line_end
+
+            if not text:
+                continue
+
+            if lines and delay:
+                # Fixed spacing on top of the governor, if requested
+                time.sleep(delay)
+
+            translated, failed = _translate_line(text, f"shard at byte {start}")
+            errors += failed
+
+            out.write(translated)
+            out.write('\n')
+            lines += 1
+
+    return {'lines': lines, 'errors': errors}
+
+def _translate_line(text: str, location: str) -> Tuple[str, int]:
+    """Translate one line in a worker; returns (output line, 1 if it failed else 0)."""
+    try:
+        return _worker_translator.translate(text, compact=True, priority=PRIORITY_BULK).text, 0
+    except Exception as e:
+        logger.error(f"❌ Failed to translate line in {location}: {e}")
+        return f"[ERROR] {e}", 1
+
+def _translate_chunk(index: int, texts: List[str], delay: float) -> Tuple[List[str], int]:
+    """Translate one chunk of streamed lines in a worker."""
+    translated = []
+    errors = 0
+    for i, text in enumerate(texts):
+        if i and delay:
+            time.sleep(delay)
+        line, failed = _translate_line(text, f"chunk {index}")
+        translated.append(line)
+        errors += failed
+    return translated, errors
+
+def parallel_translate_file(input_path: str, output: Union[str, TextIO],
+                            target_lang: str, src_lang: str = 'en',
+                            terminology_source: str = None,
+                            workers: int = None, shards_per_worker: int = 4,
+                            delay: float = 0.0, compression: str = None) -> Dict[str, int]:
+    """
+    Translate a one-sentence-per-line file using a pool of worker processes.
+
+    Output has one translated line per non-empty input line, in input
+    order, matching the CLI's --file mode. Failed lines are written as
+    "[ERROR] message".
+
+    Args:
+        input_path: Input file (UTF-8, one sentence per line); gzip, zstd and
+            xz files are detected and decompressed as a stream, and pipes
+            are read as a stream
+        output: Output file path or writable text stream
+        target_lang: Target language code
+        src_lang: Source language code (default: 'en')
+        terminology_source: Path to terminology CSV file (optional)
+        workers: Number of worker processes (default: CPU count)
+        shards_per_worker: Shards per worker, for load balancing
+        delay: Extra seconds between requests within each worker; upstream
+            pacing is otherwise left to each worker's adaptive governor
+        compression: Output compression ('gzip', 'zstd', 'xz' or 'none');
+            by default taken from the output path's extension
+
+    Returns:
+        Dictionary with 'lines', 'errors', 'shards' and 'workers' counts
+        (for streamed input, 'shards' counts the chunks)
+    """
+    workers = workers or os.cpu_count() or 1
+    # Only sniff regular files: reading a pipe's first bytes would lose them
+    if not os.path.isfile(input_path) or is_compressed(input_path):
+        return _translate_stream(input_path, output, target_lang, src_lang,
+                                          terminology_source, workers, delay, compression)
+
+    shards = compute_shards(input_path, workers * max(1, shards_per_worker))
+    stats = {'lines': 0, 'errors': 0, 'shards': len(shards), 'workers': workers}
+
+    tmp_dir = tempfile.mkdtemp(prefix='nkrane_shards_')
+    try:
+        shard_paths = [os.path.join(tmp_dir, f"shard_{i:05d}.txt") for i in range(len(shards))]
+
+        if shards:
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(shards)),
+                initializer=_init_worker,
+                initargs=(target_lang, src_lang, terminology_source)
+            ) as pool:
+                futures = [
+                    pool.submit(_translate_shard, input_path, start, end, shard_path, delay)
+                    for (start, end), shard_path in zip(shards, shard_paths)
+                ]
+                for future in futures:
+                    result = future.result()
+                    stats['lines'] += result['lines']
+                    stats['errors'] += result['errors']
+
+        _merge_shards(shard_paths, output, compression)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    return stats
+
+def _translate_stream(input_path: str, output: Union[str, TextIO],
+                      target_lang: str, src_lang: str, terminology_source: Optional[str],
+                      workers: int, delay: float, compression: Optional[str]) -> Dict[str, int]:
+    """Stream a compressed input file or pipe through the worker pool in chunks of lines."""
+    stats = {'lines': 0, 'errors': 0, 'shards': 0, 'workers': workers}
+    out = open_text(output, 'w', compression) if isinstance(output, str) else output
+    try:
+        with open_text(input_path, 'r') as fin, ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(target_lang, src_lang, terminology_source)
+        ) as pool:
+            texts = (line.strip() for line in fin)
+            texts = (text for text in texts if text)
+            pending = deque()
+
+            def write_next():
+                translated, errors = pending.popleft().result()
+                for line in translated:
+                    if stats['lines']:
+                        out.write('\n')
+                    out.write(line)
+                    stats['lines'] += 1
+                stats['errors'] += errors
+
+            while True:
+                chunk = list(islice(texts, STREAM_CHUNK_LINES))
+                if not chunk:
+                    break
+                pending.append(pool.submit(_translate_chunk, stats['shards'], chunk, delay))
+                stats['shards'] += 1
+                # Keep every worker busy without reading the whole input ahead
+                if len(pending) >= 2 * workers:
+                    write_next()
+            while pending:
+                write_next()
+    finally:
+        if out is not output:
+            out.close()
+
+    return stats
+
+def _merge_shards(shard_paths: List[str], output: Union[str, TextIO], compression: str = None):
+    """Concatenate shard outputs in order, without a trailing newline."""
+    out = open_text(output, 'w', compression) if isinstance(output, str) else output
+    try:
+        first = True
+        for shard_path in shard_paths:
+            with open(shard_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if not first:
+                        out.write('\n')
+                    out.write(line.rstrip('\n'))
+                    first = False
+    finally:
+        if out is not output:
+            out.close()
@@ -0,0 +1,143 @@
+# nkrane_gt/pipeline.py
+"""
+Pipelined translation: preprocess, network and postprocess as overlapping stages.
+
+A preprocessing thread parses texts and inserts placeholders, a small pool of
+network threads fetches translations (from the translation memory or the
+upstream API, paced by the adaptive governor), and the consuming generator
+postprocesses results and yields them in input order. A window semaphore
+caps the number of texts between being read and being yielded, which bounds
+every queue and the reorder buffer, so memory does not grow with the input.
+"""
+
+import logging
+import queue
+import threading
+import time
+from typing import Iterable, Iterator, Optional
+
+from .result import TranslationResult
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()  # End-of-stream marker, one per network thread
+
+class _Job:
+    __slots__ = ('index', 'text', 'start_time', 'preprocessed', 'replacements',
+                 'original_cases', 'translated', 'memory_match', 'error')
+
+    def __init__(self, index: int, text: str):
+        self.index = index
+        self.text = text
+        self.start_time = time.time()
+        self.preprocessed = None
+        self.replacements = None
+        self.original_cases = None
+        self.translated = None
+        self.memory_match = None
+        self.error: Optional[Exception] = None
+
+def translate_pipelined(translator, texts: Iterable[str], prefetch: int = 32,
+                        network_workers: int = 4, compact: bool = False,
+                        verbose: bool = False, priority: str = 'bulk',
+                        tenant: str = None) -> Iterator:
+    """
+    Translate texts lazily with overlapping stages; see NkraneTranslator.translate_iter.
+    """
+    prefetch = max(1, prefetch)
+    network_workers = max(1, network_workers)
+
+    window = threading.Semaphore(prefetch)
+    stop = threading.Event()
+    # The window admits at most prefetch jobs, so these queues never fill up
+    to_network = queue.Queue(maxsize=prefetch + network_workers)
+    finished = queue.Queue(maxsize=prefetch + network_workers)
+    reader_errors = []
+
+    def preprocess_stage():
+        try:
+            for index, text in enumerate(texts):
+                while not window.acquire(timeout=0.1):
+                    if stop.is_set():
+                        return
+                if stop.is_set():
+                    return
+
+                job = _Job(index, text)
+                try:
+                    job.preprocessed, job.replacements, job.original_cases = \
+                        translator.terminology_manager.preprocess_text(text)
+                except Exception as e:
+                    job.error = e
+                to_network.put(job)
+        except Exception as e:
+            # The input iterable itself failed; re-raised by the consumer
+            reader_errors.append(e)
+        finally:
+            for _ in range(network_workers):
+                to_network.put(_DONE)
+
+    def network_stage():
+        while True:
+            job = to_network.get()
+            if job is _DONE:
+                finished.put(_DONE)
+                return
+            if job.error is None and not stop.is_set():
+                try:
+                    job.translated, job.memory_match = translator._fetch_translation(
+                        job.text, job.preprocessed, priority, tenant
+                    )
+                except Exception as e:
+                    job.error = e
+            finished.put(job)
+
+    def postprocess_stage(job: _Job) -> TranslationResult:
+        if job.error is None:
+            try:
+                final_text = translator.terminology_manager.postprocess_text(
+                    job.translated, job.replacements, job.original_cases
+                )
+                return translator._build_result(
+                    job.text, job.preprocessed, job.replacements, job.translated, final_text,
+                    job.memory_match, time.time() - job.start_time, compact, verbose
+                )
+            except Exception as e:
+                job.error = e
+        logger.error(f"❌ Failed to translate text {job.index}: {job.error}")
+        return TranslationResult(text='', error=str(job.error), original=job.text)
+
+    threads = [threading.Thread(target=preprocess_stage, name='nkrane-preprocess', daemon=True)]
+    threads += [threading.Thread(target=network_stage, name=f'nkrane-network-{i}', daemon=True)
+                for i in range(network_workers)]
+    for thread in threads:
+        thread.start()
+
+    pending = {}  # Reorder buffer: index -> finished job
+    next_index = 0
+    workers_done = 0
+
+    try:
+        while True:
+            job = pending.pop(next_index, None)
+            if job is not None:
+                result = postprocess_stage(job)
+                next_index += 1
+                window.release()
+                yield result if compact else result.to_dict()
+                continue
+
+            if workers_done == network_workers:
+                break
+
+            item = finished.get()
+            if item is _DONE:
+                workers_done += 1
+            else:
+                pending[item.index] = item
+
+        if reader_errors:
+            raise reader_errors[0]
+    finally:
+        # Lets the threads wind down if the consumer stops early
+        stop.set()
@@ -0,0 +1,75 @@
+# nkrane_gt/result.py
+"""
+Compact translation results for high-volume batches.
+"""
+
+from typing import Any, Dict, Iterator, List
+
+# Fields only kept when a result is created with verbose=True
+VERBOSE_FIELDS = ('original', 'preprocessed', 'google_translation', 'replaced_terms')
+
+class TranslationResult:
+    """
+    Slotted translation result.
+
+    Holds the final text and a few scalars; the original, preprocessed and
+    Google texts and the placeholder list are optional and only stored when
+    requested, so a million results hold roughly one copy of the output
+    corpus. Supports read-only dict-style access (result['text'],
+    'error' in result, result.get(...)) and to_dict() for the full legacy
+    dictionary.
+    """
+
+    __slots__ = (
+        'text', 'src', 'dest', 'src_google', 'dest_google',
+        'replacements_count', 'translation_time', 'memory_match', 'error',
+    ) + VERBOSE_FIELDS
+
+    def __init__(self, text: str, src: str = None, dest: str = None,
+                 src_google: str = None, dest_google: str = None,
+                 replacements_count: int = 0, translation_time: float = 0.0,
+                 memory_match: str = None, error: str = None,
+                 original: str = None, preprocessed: str = None,
+                 google_translation: str = None, replaced_terms: List[str] = None):
+        self.text = text
+        self.src = src
+        self.dest = dest
+        self.src_google = src_google
+        self.dest_google = dest_google
+        self.replacements_count = replacements_count
+        self.translation_time = translation_time
+        self.memory_match = memory_match
+        self.error = error
+        self.original = original
+        self.preprocessed = preprocessed
+        self.google_translation = google_translation
+        self.replaced_terms = replaced_terms
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the result as a dictionary, omitting fields that were not kept."""
+        if self.error is not None:
+            # Same shape as the error entries batch_translate has always returned
+            return {'text': self.text, 'error': self.error, 'original': self.original}
+        return {key: getattr(self, key) for key in self.keys()}
+
+    def keys(self) -> List[str]:
+        """Names of the fields that are set."""
+        return [key for key in self.__slots__ if getattr(self, key) is not None]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = getattr(self, key, None) if key in self.__slots__ else None
+        return default if value is None else value
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__ or getattr(self, key) is None:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__slots__ and getattr(self, key) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __repr__(self) -> str:
+        return f"TranslationResult({self.to_dict()!r})"
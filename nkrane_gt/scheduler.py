@@ -0,0 +1,179 @@
+# nkrane_gt/scheduler.py
+"""
+Priority and fair-share scheduling of upstream translation requests.
+
+Requests wait for a slot before they are sent upstream. Waiting requests
+are served by priority class first ('interactive' before 'bulk'), each
+class has its own concurrency cap, and within a class tenants are served by
+weighted fair queuing: each request gets a virtual finish tag of
+max(class virtual time, tenant's last tag) + 1/weight, and the smallest tag
+goes next. A tenant submitting a 500k-line batch therefore cannot delay
+another tenant's requests by more than its weight share, and bulk work only
+uses capacity that interactive requests are not waiting for.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+PRIORITY_INTERACTIVE = 'interactive'
+PRIORITY_BULK = 'bulk'
+
+# Classes in the order they are served
+PRIORITY_CLASSES = (PRIORITY_INTERACTIVE, PRIORITY_BULK)
+
+DEFAULT_TENANT = 'default'
+
+class _Ticket:
+    __slots__ = ('priority', 'tenant', 'tag', 'enqueued', 'granted')
+
+    def __init__(self, priority: str, tenant: str, tag: float):
+        self.priority = priority
+        self.tenant = tenant
+        self.tag = tag
+        self.enqueued = time.monotonic()
+        self.granted = False
+
+class TranslationScheduler:
+    def __init__(self, max_concurrency: int = 8, class_limits: Optional[Dict[str, int]] = None,
+                 tenant_weights: Optional[Dict[str, float]] = None, governor=None,
+                 metrics_window: int = 1000):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_concurrency: Upstream requests allowed in flight across all classes
+            class_limits: Per-class caps (default: interactive 8, bulk 6)
+            tenant_weights: Fair-share weight per tenant (default weight: 1.0)
+            governor: AdaptiveGovernor whose current in-flight limit also caps
+                max_concurrency, so requests queue here (in priority order)
+                rather than inside the governor; NkraneTranslator sets it to
+                its language pair's governor when left empty
+            metrics_window: Queue-time samples kept per class for percentiles
+        """
+        self.max_concurrency = max_concurrency
+        self.class_limits = {PRIORITY_INTERACTIVE: 8, PRIORITY_BULK: 6}
+        self.class_limits.update(class_limits or {})
+        self.tenant_weights = dict(tenant_weights or {})
+        self.governor = governor
+
+        self.in_flight = {priority: 0 for priority in PRIORITY_CLASSES}
+        self.queues = {priority: [] for priority in PRIORITY_CLASSES}  # heaps of (tag, seq, ticket)
+        self.virtual_time = {priority: 0.0 for priority in PRIORITY_CLASSES}
+        self.last_tag = {}  # (priority, tenant) -> last finish tag
+        self.queue_times = {priority: deque(maxlen=metrics_window) for priority in PRIORITY_CLASSES}
+        self.completed = {priority: 0 for priority in PRIORITY_CLASSES}
+
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+
+    def _capacity(self) -> int:
+        limit = self.max_concurrency
+        if self.governor is not None:
+            limit = min(limit, max(1, int(self.governor.concurrency_limit)))
+        return limit
+
+    def _dispatch(self):
+        # Grant waiting tickets while there is capacity; caller holds the lock
+        granted = False
+        while sum(self.in_flight.values()) < self._capacity():
+            for priority in PRIORITY_CLASSES:
+                queue = self.queues[priority]
+                if queue and self.in_flight[priority] < self.class_limits.get(priority, self.max_concurrency):
+                    tag, _, ticket = heapq.heappop(queue)
+                    self.virtual_time[priority] = tag
+                    self.in_flight[priority] += 1
+                    ticket.granted = True
+                    self.queue_times[priority].append(time.monotonic() - ticket.enqueued)
+                    granted = True
+                    break
+            else:
+                break
+        if granted:
+            self._cond.notify_all()
+
+    def acquire(self, priority: str = PRIORITY_INTERACTIVE, tenant: str = None,
+                timeout: Optional[float] = None) -> _Ticket:
+        """
+        Wait for an upstream slot.
+
+        Args:
+            priority: 'interactive' or 'bulk'
+            tenant: Tenant or glossary the request is accounted to
+            timeout: Maximum seconds to wait (default: no limit)
+
+        Returns:
+            Ticket to pass to release()
+
+        Raises:
+            TimeoutError: If no slot was granted within timeout
+        """
+        if priority not in PRIORITY_CLASSES:
+            raise ValueError(f"Unknown priority class: {priority}")
+        tenant = tenant or DEFAULT_TENANT
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self._cond:
+            key = (priority, tenant)
+            weight = self.tenant_weights.get(tenant, 1.0)
+            tag = max(self.virtual_time[priority], self.last_tag.get(key, 0.0)) + 1.0 / weight
+            self.last_tag[key] = tag
+
+            ticket = _Ticket(priority, tenant, tag)
+            heapq.heappush(self.queues[priority], (tag, next(self._seq), ticket))
+            self._dispatch()
+
+            while not ticket.granted:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    self.queues[priority] = [e for e in self.queues[priority] if e[2] is not ticket]
+                    heapq.heapify(self.queues[priority])
+                    raise TimeoutError(f"No {priority} slot available within {timeout}s")
+                # Wake up periodically in case the governor raised its limit
+                self._cond.wait(0.5 if remaining is None else min(remaining, 0.5))
+                self._dispatch()
+
+            return ticket
+
+    def release(self, ticket: _Ticket):
+        """Return the slot held by ticket."""
+        with self._cond:
+            self.in_flight[ticket.priority] -= 1
+            self.completed[ticket.priority] += 1
+            self._dispatch()
+
+    @contextmanager
+    def slot(self, priority: str = PRIORITY_INTERACTIVE, tenant: str = None):
+        """Context manager holding an upstream slot."""
+        ticket = self.acquire(priority, tenant)
+        try:
+            yield ticket
+        finally:
+            self.release(ticket)
+
+    def snapshot(self) -> Dict:
+        """Per-class in-flight, waiting and queue-time metrics (seconds)."""
+        with self._cond:
+            classes = {}
+            for priority in PRIORITY_CLASSES:
+                samples = sorted(self.queue_times[priority])
+                classes[priority] = {
+                    'in_flight': self.in_flight[priority],
+                    'waiting': len(self.queues[priority]),
+                    'limit': self.class_limits.get(priority, self.max_concurrency),
+                    'completed': self.completed[priority],
+                    'queue_time_mean': sum(samples) / len(samples) if samples else 0.0,
+                    'queue_time_p50': _percentile(samples, 0.50),
+                    'queue_time_p99': _percentile(samples, 0.99),
+                }
+            return {'capacity': self._capacity(), 'classes': classes}
+
+def _percentile(sorted_samples, fraction: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, int(round(fraction * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
@@ -1,11 +1,15 @@
 # nkrane_gt/terminology_manager.py
 import os
 import csv
+import io
+import itertools
 import re
 import spacy
-from typing import Dict, List, Tuple, Optional, Set
+from typing import Dict, Iterator, List, Tuple, Optional, Set
 from dataclasses import dataclass
 
+from .compression import open_text
+
 # Load spaCy model for English
 try:
     nlp = spacy.load("en_core_web_sm")
@@ -16,6 +20,107 @@ except:
     SPACY_AVAILABLE = False
     STOPWORDS = set()
 
+# Fast tokenization for the glossary prefilter
+WORD_RE = re.compile(r'\w+')
+
+# Generic English suffix rules, used when the spaCy lemmatizer tables are unavailable
+DEFAULT_SUFFIX_RULES = [
+    ('s', ''), ('es', ''), ('ies', 'y'), ('ves', 'f'), ('men', 'man'),
+    ('ed', ''), ('ed', 'e'), ('ing', ''), ('ing', 'e'), ('er', ''), ('est', ''),
+]
+
+def _load_lemma_tables() -> Tuple[List[Tuple[str, str]], Dict[str, Set[str]]]:
+    """
+    Collect the suffix rules and exceptions of spaCy's rule-based lemmatizer.
+
+    Applying every rule to a word yields a superset of the lemmas spaCy can
+    assign to it, which lets the prefilter reject sentences without parsing
+    them and without missing inflected forms.
+    """
+    rules = set(DEFAULT_SUFFIX_RULES)
+    exceptions = {}
+    if SPACY_AVAILABLE and 'lemmatizer' in nlp.pipe_names:
+        try:
+            lookups = nlp.get_pipe('lemmatizer').lookups
+            if lookups.has_table('lemma_rules'):
+                for pos_rules in lookups.get_table('lemma_rules').values():
+                    rules.update((old, new) for old, new in pos_rules)
+            if lookups.has_table('lemma_exc'):
+                for pos_exc in lookups.get_table('lemma_exc').values():
+                    for form, lemmas in pos_exc.items():
+                        exceptions.setdefault(form, set()).update(lemmas)
+        except Exception:
+            pass
+    return sorted(r for r in rules if r[0]), exceptions
+
+def _detect_delimiter(sample: str) -> str:
+    """Guess the delimiter of a terminology file from its first bytes."""
+    # Check for common delimiters
+    if ',' in sample:
+        return ','
+    elif ';' in sample:
+        return ';'
+    elif '\t' in sample:
+        return '\t'
+    return ','  # default
+
+def iter_csv_terms(csv_path: str) -> Iterator[Tuple[str, str]]:
+    """
+    Stream (english_term, translation) pairs from a terminology CSV.
+
+    Rows are yielded in file order without being collected, so arbitrarily
+    large glossaries can be read in constant memory. English terms are
+    lowercased; rows with an empty term or translation are skipped.
+
+    Args:
+        csv_path: Path to the terminology CSV (comma, semicolon or tab
+            separated; may be gzip, zstd or xz compressed)
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If the file has fewer than 2 columns
+    """
+    with open_text(csv_path, 'r', newline='') as f:
+        # Try to detect the delimiter; compressed streams cannot always seek
+        # back, so the sample (completed to a whole line) is read again
+        sample = f.read(1024)
+        sample += f.readline()
+        delimiter = _detect_delimiter(sample)
+
+        reader = csv.DictReader(itertools.chain(io.StringIO(sample, newline=''), f), delimiter=delimiter)
+        columns = {name.lower(): name for name in reader.fieldnames or []}
+
+        # Determine which columns to use
+        text_col = None
+        trans_col = None
+
+        # Look for text column
+        for col in ['text', 'english', 'source', 'term', 'word']:
+            if col in columns:
+                text_col = columns[col]
+                break
+
+        # Look for translation column
+        for col in ['text_translated', 'translation', 'target', 'translated']:
+            if col in columns:
+                trans_col = columns[col]
+                break
+
+        # If not found, use first two columns
+        if not text_col or not trans_col:
+            if len(columns) >= 2:
+                text_col = reader.fieldnames[0]
+                trans_col = reader.fieldnames[1]
+            else:
+                raise ValueError("CSV needs at least 2 columns")
+
+        for row in reader:
+            english_term = (row.get(text_col) or '').strip().lower()
+            translation = (row.get(trans_col) or '').strip()
+
+            if english_term and translation:
+                yield english_term, translation
+
 @dataclass
 class Term:
     term: str
@@ -33,6 +138,11 @@ class TerminologyManager:
         """
         self.target_lang = target_lang
         self.terms = {}  # Dictionary: english_term -> translation
+        self.lemma_index = {}  # Dictionary: lemma key -> english_term
+        self.prefilter_tokens = set()  # Every glossary content word and lemma word
+        self.prefilter_stats = {'checked': 0, 'skipped': 0, 'sentences_skipped': 0}
+        self._suffix_rules = None
+        self._lemma_exceptions = None
         self.csv_provided = False
 
         # Load user terms
@@ -44,66 +154,109 @@ class TerminologyManager:
     def _load_user_terms(self, csv_path: str):
         """Load user terms from CSV file."""
         try:
-            with open(csv_path, 'r', encoding='utf-8') as f:
-                # Try to detect the delimiter
-                sample = f.read(1024)
-                f.seek(0)
-
-                # Check for common delimiters
-                if ',' in sample:
-                    delimiter = ','
-                elif ';' in sample:
-                    delimiter = ';'
-                elif '\t' in sample:
-                    delimiter = '\t'
-                else:
-                    delimiter = ','  # default
-
-                reader = csv.DictReader(f, delimiter=delimiter)
-                fieldnames = [f.lower() for f in reader.fieldnames] if reader.fieldnames else []
-
-                # Determine which columns to use
-                text_col = None
-                trans_col = None
-
-                # Look for text column
-                for col in ['text', 'english', 'source', 'term', 'word']:
-                    if col in fieldnames:
-                        text_col = col
-                        break
-
-                # Look for translation column
-                for col in ['text_translated', 'translation', 'target', 'translated']:
-                    if col in fieldnames:
-                        trans_col = col
-                        break
-
-                # If not found, use first two columns
-                if not text_col or not trans_col:
-                    if len(fieldnames) >= 2:
-                        text_col = reader.fieldnames[0]
-                        trans_col = reader.fieldnames[1]
-                    else:
-                        print(f"❌ Error: CSV needs at least 2 columns")
-                        return
-
-                # Read terms
-                user_terms_count = 0
-                for row in reader:
-                    english_term = row.get(text_col, '').strip().lower()
-                    translation = row.get(trans_col, '').strip()
-
-                    if english_term and translation:
-                        self.terms[english_term] = translation
-                        user_terms_count += 1
-
-                self.csv_provided = True
-                print(f"✅ Loaded {user_terms_count} terms from {csv_path}")
+            user_terms_count = 0
+            for english_term, translation in iter_csv_terms(csv_path):
+                self.terms[english_term] = translation
+                user_terms_count += 1
+
+            self.csv_provided = True
+            print(f"✅ Loaded {user_terms_count} terms from {csv_path}")
 
         except FileNotFoundError:
             print(f"❌ Error: CSV file not found at '{csv_path}'")
+        except ValueError as e:
+            print(f"❌ Error: {e}")
         except Exception as e:
             print(f"❌ Error loading user CSV: {e}")
+        finally:
+            # Index whatever was loaded, even if the file failed partway
+            if self.terms:
+                self._build_lemma_index()
+
+    def _build_lemma_index(self):
+        """
+        Normalize every term once so query-time matching is a dict lookup.
+
+        Each term is reduced to the lowercased lemmas of its content words
+        ("train stations" -> "train station"), the same key that
+        _extract_noun_phrases computes from the already-parsed sentence.
+        """
+        self.lemma_index = {}
+        terms = list(self.terms.keys())
+
+        if not SPACY_AVAILABLE:
+            for term in terms:
+                self.lemma_index.setdefault(self._remove_stopwords(term), term)
+            self._build_prefilter()
+            return
+
+        # Terms are short, so the tagger/lemmatizer is all we need
+        disabled = [name for name in ('parser', 'ner') if name in nlp.pipe_names]
+        for term, doc in zip(terms, nlp.pipe(terms, disable=disabled, batch_size=1000)):
+            key = self._lemma_key([token for token in doc if not token.is_stop])
+            if key:
+                # Exact surface forms win over other terms sharing a lemma
+                if key == term or key not in self.lemma_index:
+                    self.lemma_index[key] = term
+
+        self._build_prefilter()
+
+    def _build_prefilter(self):
+        """Collect the content words and lemma words of every term for could_match."""
+        self.prefilter_tokens = set()
+        for key in self.lemma_index:
+            self.prefilter_tokens.update(WORD_RE.findall(key))
+        for term in self.terms:
+            words = WORD_RE.findall(term)
+            if SPACY_AVAILABLE:
+                # Noun phrases are matched on their content words only, and a
+                # stopword like the 'of' in 'bank of ghana' would pass nearly
+                # every sentence; the fallback matches whole words, stopwords too
+                words = [word for word in words if word not in STOPWORDS]
+            self.prefilter_tokens.update(words)
+
+        if self._suffix_rules is None:
+            self._suffix_rules, self._lemma_exceptions = _load_lemma_tables()
+
+    def could_match(self, text: str) -> bool:
+        """
+        Cheap check whether any glossary term can match in text.
+
+        Tokenizes with a regex and tests each word, and each lemma the
+        rule-based lemmatizer could give it, against the glossary's words.
+        False means the text certainly contains no term, so parsing it can
+        be skipped.
+        """
+        if self._suffix_rules is None:
+            # No index built (yet): only safe to skip when there are no terms
+            return bool(self.terms)
+        tokens = self.prefilter_tokens
+
+        for word in WORD_RE.findall(text.lower()):
+            if word in tokens:
+                return True
+            lemmas = self._lemma_exceptions.get(word)
+            if lemmas and not tokens.isdisjoint(lemmas):
+                return True
+            for old, new in self._suffix_rules:
+                if word.endswith(old) and word[:len(word) - len(old)] + new in tokens:
+                    return True
+        return False
+
+    @staticmethod
+    def _lemma_key(tokens) -> str:
+        """Build the lemma lookup key for a sequence of spaCy tokens."""
+        return ' '.join((token.lemma_ or token.text).lower() for token in tokens).strip()
+
+    def _match_term(self, phrase: Dict) -> Optional[str]:
+        """Return the glossary term matching a noun phrase, if any."""
+        phrase_lower = phrase['text'].lower()
+        if phrase_lower in self.terms:
+            return phrase_lower
+        lemma = phrase.get('lemma')
+        if lemma is None:
+            lemma = phrase_lower
+        return self.lemma_index.get(lemma)
 
     def _remove_stopwords(self, phrase: str) -> str:
         """Remove stopwords from a phrase."""
@@ -183,6 +336,7 @@ class TerminologyManager:
 
             noun_phrases.append({
                 'text': content_text,  # Only content words, no stopwords
+                'lemma': self._lemma_key(content_tokens),  # Key into lemma_index
                 'full_text': chunk.text,  # Original full phrase with stopwords
                 'chunk_start': chunk.start_char,  # Start of the entire chunk (including leading stopwords)
                 'chunk_end': chunk.end_char,  # End of the entire chunk (including trailing stopwords)
@@ -210,6 +364,12 @@ class TerminologyManager:
             # No terms to substitute
             return text, {}, {}
 
+        # Skip parsing entirely when no glossary word occurs in the text
+        self.prefilter_stats['checked'] += 1
+        if not self.could_match(text):
+            self.prefilter_stats['skipped'] += 1
+            return text, {}, {}
+
         # Split into sentences to process separately
         if SPACY_AVAILABLE:
             doc = nlp(text)
@@ -226,25 +386,24 @@ class TerminologyManager:
         placeholder_counter = 0  # Shared counter across all sentences
 
         for sentence in sentences:
+            # Sentences without glossary words need no noun-chunk extraction
+            if not self.could_match(sentence):
+                self.prefilter_stats['sentences_skipped'] += 1
+                processed_sentences.append(sentence)
+                continue
+
             # Extract noun phrases from the sentence
             noun_phrases = self._extract_noun_phrases(sentence)
 
             # Find phrases that match our terminology (case-insensitive)
+            # Exact content-word match first, then the precomputed lemma index
             matching_phrases = []
             for phrase in noun_phrases:
-                phrase_lower = phrase['text'].lower()
-                
-                # Try exact match with content words
-                if phrase_lower in self.terms:
-                    matching_phrases.append(phrase)
-                else:
-                    # Try without any remaining stopwords (should already be clean, but double-check)
-                    cleaned = self._remove_stopwords(phrase_lower)
-                    if cleaned and cleaned in self.terms:
-                        # Update the phrase info with cleaned version
-                        phrase_copy = phrase.copy()
-                        phrase_copy['text'] = cleaned
-                        matching_phrases.append(phrase_copy)
+                term = self._match_term(phrase)
+                if term:
+                    phrase_copy = phrase.copy()
+                    phrase_copy['term'] = term
+                    matching_phrases.append(phrase_copy)
 
             # Sort by position (end to start) to avoid replacement issues
             matching_phrases.sort(key=lambda x: x.get('chunk_start', x['start']), reverse=True)
@@ -254,8 +413,7 @@ class TerminologyManager:
             sentence_original_cases = {}
 
             for phrase in matching_phrases:
-                phrase_lower = phrase['text'].lower()
-                translation = self.terms.get(phrase_lower)
+                translation = self.terms.get(phrase['term'])
 
                 if translation:
                     placeholder = f"<{placeholder_counter}>"
@@ -413,6 +571,10 @@ class TerminologyManager:
         
         return result
 
+    def get_prefilter_stats(self) -> Dict[str, int]:
+        """Texts checked by the prefilter, texts that skipped parsing, and skipped sentences."""
+        return dict(self.prefilter_stats)
+
     def get_terms_count(self) -> Dict[str, int]:
         """Get count of terms."""
         return {
@@ -0,0 +1,281 @@
+# nkrane_gt/translation_memory.py
+"""
+Translation memory with exact and fuzzy (n-gram indexed) reuse.
+
+Entries are keyed by the preprocessed text, i.e. the sentence after
+terminology placeholders were inserted, and store the upstream translation
+of that text with its placeholders still in place. A hit therefore skips the
+network call and goes straight to postprocess_text with the current
+sentence's replacements.
+
+Fuzzy matches are found through an inverted index of word bigrams (numbers
+and capitalized names are normalized, so swapping them does not break
+bigrams and short sentences still reach the threshold) and scored by Jaccard
+similarity. A fuzzy candidate is only reused if every difference from the
+query is a one-to-one swap of a number or capitalized name that appears
+exactly once, verbatim, in the stored translation; those tokens are then
+substituted in the translation. Capitalized stopwords and the first word of
+a sentence are not treated as names, since the upstream sometimes leaves
+them untranslated ('When it rains' -> 'When il pleut'). Anything else falls
+back to the network.
+"""
+
+import difflib
+import json
+import re
+import threading
+from collections import Counter
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from spacy.lang.en.stop_words import STOP_WORDS
+
+from .language_codes import convert_lang_code
+
+POLICY_EXACT = 'exact'
+POLICY_FUZZY = 'fuzzy'
+
+_TOKEN_RE = re.compile(r"<\d+>|\w+|[^\w\s]", re.UNICODE)
+_NUMBER_RE = re.compile(r"^\d+([.,]\d+)*$")
+_PLACEHOLDER_RE = re.compile(r"^<\d+>$")
+
+# Key of the header record that save() writes first
+_HEADER_KEY = 'nkrane_memory'
+
+def _tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text)
+
+_SENTENCE_END = {'.', '!', '?'}
+
+def _alignable_flags(tokens: List[str]) -> List[bool]:
+    """For each token, whether it is usually copied verbatim into a translation."""
+    flags = []
+    sentence_start = True
+    for token in tokens:
+        if _PLACEHOLDER_RE.match(token):
+            flags.append(False)
+            sentence_start = False
+        elif _NUMBER_RE.match(token):
+            flags.append(True)
+            sentence_start = False
+        elif token[:1].isalpha():
+            # Capitalization says nothing at the start of a sentence
+            flags.append(not sentence_start and token[:1].isupper() and token[1:].islower()
+                         and token.lower() not in STOP_WORDS)
+            sentence_start = False
+        else:
+            flags.append(False)
+            if token in _SENTENCE_END:
+                sentence_start = True
+    return flags
+
+def _shingles(tokens: List[str]) -> set:
+    # Tokens _align can swap get one class, so the swap costs no similarity
+    flags = _alignable_flags(tokens)
+    normalized = ['<var>' if flag else t.lower() for t, flag in zip(tokens, flags)]
+    padded = ['^'] + normalized + ['$']
+    return {padded[i] + ' ' + padded[i + 1] for i in range(len(padded) - 1)}
+
+class TranslationMemory:
+    def __init__(self, src_lang: str = None, target_lang: str = None,
+                 policy: str = POLICY_FUZZY, threshold: float = 0.6,
+                 max_candidates: int = 5, max_postings: int = 5000):
+        """
+        Initialize translation memory.
+
+        Args:
+            src_lang: Source language of the stored pairs (checked by NkraneTranslator)
+            target_lang: Target language of the stored pairs
+            policy: 'exact' (only identical preprocessed text) or 'fuzzy'
+            threshold: Minimum bigram Jaccard similarity for fuzzy candidates
+            max_candidates: Fuzzy candidates tried for alignment, best first
+            max_postings: Bigrams shared by more entries than this are ignored
+                when searching, which keeps lookups fast on large memories
+        """
+        if policy not in (POLICY_EXACT, POLICY_FUZZY):
+            raise ValueError(f"Unknown reuse policy: {policy}")
+
+        self.src_lang = src_lang
+        self.target_lang = target_lang
+        self.policy = policy
+        self.threshold = threshold
+        self.max_candidates = max_candidates
+        self.max_postings = max_postings
+
+        self.entries = []  # List of (source, preprocessed, translation)
+        self.exact = {}  # preprocessed text -> entry id
+        self.index = {}  # bigram -> list of entry ids
+        self.shingle_counts = []  # entry id -> number of bigrams
+
+        self.stats = {'lookups': 0, 'exact_hits': 0, 'fuzzy_hits': 0, 'misses': 0, 'entries': 0}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, source: str, preprocessed: str, translation: str):
+        """
+        Store a translation.
+
+        Args:
+            source: Original sentence
+            preprocessed: Sentence with terminology placeholders (lookup key)
+            translation: Upstream translation of preprocessed, placeholders intact
+        """
+        with self._lock:
+            entry_id = self.exact.get(preprocessed)
+            if entry_id is not None:
+                # Keep the index, refresh the stored translation
+                self.entries[entry_id] = (source, preprocessed, translation)
+                return
+
+            entry_id = len(self.entries)
+            self.entries.append((source, preprocessed, translation))
+            self.exact[preprocessed] = entry_id
+
+            shingles = _shingles(_tokenize(preprocessed))
+            self.shingle_counts.append(len(shingles))
+            for shingle in shingles:
+                self.index.setdefault(shingle, []).append(entry_id)
+            self.stats['entries'] = len(self.entries)
+
+    def lookup(self, preprocessed: str, record: bool = True) -> Optional[Tuple[str, str]]:
+        """
+        Find a reusable translation for preprocessed text.
+
+        Args:
+            preprocessed: Sentence with terminology placeholders
+            record: Count the lookup in stats (False for dry runs)
+
+        Returns:
+            (translation, match_type) with match_type 'exact' or 'fuzzy',
+            or None if nothing can be reused
+        """
+        with self._lock:
+            hit = None
+            entry_id = self.exact.get(preprocessed)
+            if entry_id is not None:
+                hit = self.entries[entry_id][2], POLICY_EXACT
+            elif self.policy == POLICY_FUZZY:
+                translation = self._fuzzy_lookup(preprocessed)
+                if translation is not None:
+                    hit = translation, POLICY_FUZZY
+
+            if record:
+                self.stats['lookups'] += 1
+                self.stats[hit[1] + '_hits' if hit else 'misses'] += 1
+            return hit
+
+    def _fuzzy_lookup(self, preprocessed: str) -> Optional[str]:
+        tokens = _tokenize(preprocessed)
+        shingles = _shingles(tokens)
+
+        shared = Counter()
+        for shingle in shingles:
+            postings = self.index.get(shingle)
+            if postings and len(postings) <= self.max_postings:
+                shared.update(postings)
+
+        scored = []
+        for entry_id, count in shared.items():
+            similarity = count / (len(shingles) + self.shingle_counts[entry_id] - count)
+            if similarity >= self.threshold:
+                scored.append((similarity, entry_id))
+        scored.sort(reverse=True)
+
+        for _, entry_id in scored[:self.max_candidates]:
+            _, stored_preprocessed, stored_translation = self.entries[entry_id]
+            adapted = self._align(_tokenize(stored_preprocessed), tokens, stored_translation)
+            if adapted is not None:
+                return adapted
+        return None
+
+    @staticmethod
+    def _align(stored_tokens: List[str], query_tokens: List[str], translation: str) -> Optional[str]:
+        """Carry token swaps between stored and query sentence into the translation."""
+        swaps = []
+        stored_flags = _alignable_flags(stored_tokens)
+        query_flags = _alignable_flags(query_tokens)
+        matcher = difflib.SequenceMatcher(a=stored_tokens, b=query_tokens, autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == 'equal':
+                continue
+            if tag != 'replace' or (i2 - i1) != (j2 - j1):
+                return None
+            for i, j in zip(range(i1, i2), range(j1, j2)):
+                if not (stored_flags[i] and query_flags[j]):
+                    return None
+                swaps.append((stored_tokens[i], query_tokens[j]))
+
+        # Locate every swapped token first so one swap cannot feed another
+        spans = []
+        for old, new in swaps:
+            matches = list(re.finditer(r'(?<!\w)' + re.escape(old) + r'(?!\w)', translation))
+            if len(matches) != 1:
+                return None
+            spans.append((matches[0].start(), matches[0].end(), new))
+
+        spans.sort()
+        for (_, end, _), (start, _, _) in zip(spans, spans[1:]):
+            if start < end:
+                return None
+
+        for start, end, new in reversed(spans):
+            translation = translation[:start] + new + translation[end:]
+        return translation
+
+    def iter_entries(self) -> Iterator[Dict[str, str]]:
+        """Iterate over stored entries as dictionaries."""
+        for source, preprocessed, translation in list(self.entries):
+            yield {'source': source, 'preprocessed': preprocessed, 'translation': translation}
+
+    def save(self, path: str) -> int:
+        """
+        Write all entries to a JSONL file. Returns the number written.
+
+        The first line is a header record with the memory's language pair,
+        which load() checks.
+        """
+        count = 0
+        with open(path, 'w', encoding='utf-8') as f:
+            header = {_HEADER_KEY: 1, 'src_lang': self.src_lang, 'target_lang': self.target_lang}
+            f.write(json.dumps(header, ensure_ascii=False))
+            f.write('\n')
+            for entry in self.iter_entries():
+                f.write(json.dumps(entry, ensure_ascii=False))
+                f.write('\n')
+                count += 1
+        return count
+
+    def load(self, path: str) -> int:
+        """
+        Add entries from a JSONL file written by save(). Returns the number read.
+
+        Languages missing on this memory are taken from the file's header.
+
+        Raises:
+            ValueError: If the file holds a different language pair
+        """
+        count = 0
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if _HEADER_KEY in entry:
+                    self._check_languages(entry, path)
+                    continue
+                self.add(entry.get('source', ''), entry['preprocessed'], entry['translation'])
+                count += 1
+        return count
+
+    def _check_languages(self, header: Dict, path: str):
+        """Adopt or verify the language pair recorded in a saved memory."""
+        for attr, label in (('src_lang', 'source'), ('target_lang', 'target')):
+            saved, own = header.get(attr), getattr(self, attr)
+            if not saved:
+                continue
+            if not own:
+                setattr(self, attr, saved)
+            elif convert_lang_code(saved, to_google=True) != convert_lang_code(own, to_google=True):
+                raise ValueError(f"Translation memory {path} holds {label} language '{saved}', "
+                                 f"not '{own}'")
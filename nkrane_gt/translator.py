@@ -2,16 +2,30 @@
 import logging
 import time
 import requests
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Callable, Iterable, Iterator, Optional, Union
 from .terminology_manager import TerminologyManager
 from .language_codes import convert_lang_code, is_google_supported
+from .result import TranslationResult
+from .translation_memory import TranslationMemory
+from .hedging import RequestHedger
+from .integrity import PlaceholderValidator
+from .scheduler import TranslationScheduler, PRIORITY_INTERACTIVE, PRIORITY_BULK
+from .governor import (
+    get_governor, OUTCOME_OK, OUTCOME_THROTTLED, OUTCOME_TIMEOUT,
+    OUTCOME_UNAVAILABLE, OUTCOME_ERROR, CIRCUIT_CLOSED, CircuitOpenError
+)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class NkraneTranslator:
     def __init__(self, target_lang: str, src_lang: str = 'en', 
-                 terminology_source: str = None):
+                 terminology_source: str = None, adaptive_rate: bool = True,
+                 governor_options: Optional[Dict[str, Any]] = None,
+                 translation_memory: Optional[TranslationMemory] = None,
+                 scheduler: Optional[TranslationScheduler] = None, tenant: str = None,
+                 placeholder_retries: int = 2, hedge_requests: bool = False,
+                 hedge_options: Optional[Dict[str, Any]] = None):
         """
         Initialize Nkrane Translator.
 
@@ -19,6 +33,24 @@ class NkraneTranslator:
             target_lang: Target language code (e.g., 'ak', 'ee', 'gaa')
             src_lang: Source language code (default: 'en')
             terminology_source: Path to user's terminology CSV file (optional)
+            adaptive_rate: Pace upstream requests with the shared adaptive
+                governor for this language pair (default: True). If False,
+                batch_translate falls back to a fixed 0.5s delay.
+            governor_options: AdaptiveGovernor settings, used only if this is
+                the first translator for the language pair in the process
+            translation_memory: TranslationMemory consulted before every
+                upstream request and filled with new translations (optional)
+            scheduler: TranslationScheduler shared with other translators, which
+                orders upstream requests by priority class and tenant (optional)
+            tenant: Tenant this translator's requests are accounted to in the
+                scheduler (default: the glossary path, or 'default')
+            placeholder_retries: Re-requests allowed per sentence whose
+                placeholders the upstream dropped, repeated or altered
+                (0 disables the integrity check)
+            hedge_requests: Send a duplicate of upstream requests that are slower
+                than usual and use whichever answers first (default: False)
+            hedge_options: RequestHedger settings, e.g. {'percentile': 0.9,
+                'budget': 0.05} (optional)
         """
         self.target_lang = target_lang
         self.src_lang = src_lang
@@ -33,6 +65,35 @@ class NkraneTranslator:
         self.src_lang_google = convert_lang_code(src_lang, to_google=True)
         self.target_lang_google = convert_lang_code(target_lang, to_google=True)
 
+        # Translation memory must hold pairs for this language pair
+        if translation_memory is not None:
+            for memory_lang, lang, label in ((translation_memory.src_lang, src_lang, 'source'),
+                                             (translation_memory.target_lang, target_lang, 'target')):
+                if memory_lang and convert_lang_code(memory_lang, to_google=True) != \
+                        convert_lang_code(lang, to_google=True):
+                    raise ValueError(f"Translation memory {label} language '{memory_lang}' "
+                                     f"does not match translator {label} language '{lang}'")
+        self.translation_memory = translation_memory
+        self.scheduler = scheduler
+        self.tenant = tenant or terminology_source or 'default'
+        self.placeholder_validator = PlaceholderValidator(placeholder_retries) \
+            if placeholder_retries > 0 else None
+        self.hedger = RequestHedger(**(hedge_options or {})) if hedge_requests else None
+
+        # Requests for the same language pair share one adaptive governor
+        self.governor = get_governor(
+            self.src_lang_google, self.target_lang_google, **(governor_options or {})
+        ) if adaptive_rate else None
+
+        # The scheduler can only order requests if it also holds them back
+        # while the governor is at its in-flight limit
+        if scheduler is not None and self.governor is not None:
+            if scheduler.governor is None:
+                scheduler.governor = self.governor
+            elif scheduler.governor is not self.governor:
+                raise ValueError(f"Scheduler already paces {scheduler.governor.name}; "
+                                 f"use one TranslationScheduler per language pair")
+
         # Check if Google Translate supports these languages
         if not is_google_supported(src_lang):
             logger.warning(f"⚠️  Source language '{src_lang}' may not be supported by Google Translate")
@@ -45,10 +106,40 @@ class NkraneTranslator:
         if stats['total'] > 0:
             logger.info(f"📚 Terminology loaded: {stats['total']} terms")
 
-    def _google_translate_sync(self, text: str) -> str:
+    def _google_translate_sync(self, text: str, wait_if_open: bool = False) -> str:
         """
         Synchronous Google Translate using requests.
         Uses the same endpoint that googletrans library uses.
+
+        With hedging enabled, a request that has been on the wire longer
+        than the recent latency percentile is duplicated and the first
+        answer wins. The duplicate does not wait for a governor slot (the
+        hedging budget bounds it instead), but its outcome is reported to
+        the governor, and it is not sent while the circuit is not closed.
+
+        Fails fast with CircuitOpenError while the circuit is open, unless
+        wait_if_open is set (bulk requests), in which case it waits for the
+        cooldown and the probe.
+        """
+        if self.hedger is None:
+            return self._google_request(text, wait_if_open=wait_if_open)
+        return self.hedger.call(
+            lambda on_send: self._google_request(text, wait_if_open=wait_if_open, on_send=on_send),
+            hedge=lambda on_send: self._google_request(text, governed=False, on_send=on_send),
+            allow=lambda: self.governor is None or self.governor.circuit == CIRCUIT_CLOSED
+        )
+
+    def _google_request(self, text: str, governed: bool = True, wait_if_open: bool = False,
+                        on_send: Optional[Callable[[], None]] = None) -> str:
+        """
+        Send one request to the Google Translate endpoint.
+
+        Args:
+            text: Text to translate
+            governed: Wait for a governor slot first (False for hedges, which
+                only report their outcome)
+            wait_if_open: Wait out an open circuit instead of failing
+            on_send: Called once the governor has let the request go
         """
         # Google Translate web API endpoint (same one googletrans uses)
         url = "https://translate.googleapis.com/translate_a/single"
@@ -65,8 +156,20 @@ class NkraneTranslator:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
 
+        governor = self.governor
+        start = governor.acquire(wait_if_open=wait_if_open) if governor and governed else time.monotonic()
+        if on_send:
+            on_send()
+        outcome = OUTCOME_ERROR
+
         try:
+            sent = time.monotonic()
             response = requests.get(url, params=params, headers=headers, timeout=30)
+            if self.hedger:
+                # Only time on the wire counts towards the hedge delay
+                self.hedger.record(time.monotonic() - sent)
+            if response.status_code == 429 or response.status_code >= 500:
+                outcome = OUTCOME_THROTTLED
             response.raise_for_status()
 
             # Parse the response (Google returns a nested list)
@@ -80,26 +183,59 @@ class NkraneTranslator:
                     if item and len(item) > 0:
                         translated_parts.append(item[0])
 
+            outcome = OUTCOME_OK
             return ''.join(translated_parts)
 
         except requests.exceptions.Timeout:
+            outcome = OUTCOME_TIMEOUT
             raise TimeoutError("Google Translate request timed out after 30 seconds")
+        except requests.exceptions.ConnectionError as e:
+            outcome = OUTCOME_UNAVAILABLE
+            raise Exception(f"Google Translate API error: {e}")
         except requests.exceptions.RequestException as e:
             raise Exception(f"Google Translate API error: {e}")
         except (IndexError, TypeError) as e:
             raise Exception(f"Failed to parse Google Translate response: {e}")
-
-    def translate(self, text: str, debug: bool = False, **kwargs) -> Dict[str, Any]:
+        finally:
+            if governor and governed:
+                governor.release(start, outcome)
+            elif governor:
+                governor.report(start, outcome)
+
+    def get_governor_stats(self) -> Optional[Dict[str, Any]]:
+        """Current upstream limits and backoff state for this language pair."""
+        return self.governor.snapshot() if self.governor else None
+
+    def get_scheduler_stats(self) -> Optional[Dict[str, Any]]:
+        """Per-class queue and in-flight metrics of the shared scheduler."""
+        return self.scheduler.snapshot() if self.scheduler else None
+
+    def get_hedging_stats(self) -> Optional[Dict[str, Any]]:
+        """Hedge rate, hedge wins and the current hedge delay."""
+        return self.hedger.snapshot() if self.hedger else None
+
+    def get_integrity_stats(self) -> Optional[Dict[str, int]]:
+        """Placeholder integrity issues found and sentence retries made."""
+        return self.placeholder_validator.snapshot() if self.placeholder_validator else None
+
+    def translate(self, text: str, debug: bool = False, compact: bool = False,
+                  verbose: bool = False, priority: str = PRIORITY_INTERACTIVE,
+                  tenant: str = None, **kwargs) -> Union[Dict[str, Any], TranslationResult]:
         """
         Translate text with terminology control.
 
         Args:
             text: Text to translate
             debug: If True, print detailed debug information
+            compact: If True, return a slotted TranslationResult instead of a dict
+            verbose: With compact=True, also keep the original, preprocessed and
+                Google texts and the placeholder list
+            priority: Scheduler class, 'interactive' (default) or 'bulk'
+            tenant: Scheduler tenant (default: the translator's tenant)
             **kwargs: Additional arguments (kept for API compatibility)
 
         Returns:
-            Dictionary with translation results
+            Dictionary with translation results, or a TranslationResult if compact
         """
         start_time = time.time()
 
@@ -125,11 +261,15 @@ class NkraneTranslator:
             logger.debug(f"Preprocessed text: {preprocessed_text}")
             logger.debug(f"Replacements: {list(replacements.keys())}")
 
-            # Step 2: Translate using synchronous Google Translate API
-            translated_with_placeholders = self._google_translate_sync(preprocessed_text)
+            # Step 2: Reuse a translation memory match, or translate using
+            # the synchronous Google Translate API
+            translated_with_placeholders, memory_match = self._fetch_translation(
+                text, preprocessed_text, priority, tenant
+            )
 
             if debug:
-                print(f"\n🌐 Google translation (with placeholders):\n   {translated_with_placeholders}")
+                source_label = f"Translation memory ({memory_match} match)" if memory_match else "Google translation"
+                print(f"\n🌐 {source_label} (with placeholders):\n   {translated_with_placeholders}")
 
             # Step 3: Postprocess - replace placeholders with translations
             final_text = self.terminology_manager.postprocess_text(
@@ -145,26 +285,193 @@ class NkraneTranslator:
                 print(f"\n⏱️  Translation time: {end_time - start_time:.2f}s")
                 print("="*60 + "\n")
 
-            return {
-                'text': final_text,
-                'src': self.src_lang,
-                'dest': self.target_lang,
-                'original': text,
-                'preprocessed': preprocessed_text,
-                'google_translation': translated_with_placeholders,
-                'replacements_count': len(replacements),
-                'src_google': self.src_lang_google,
-                'dest_google': self.target_lang_google,
-                'replaced_terms': list(replacements.keys()),
-                'translation_time': end_time - start_time
-            }
+            result = self._build_result(
+                text, preprocessed_text, replacements, translated_with_placeholders,
+                final_text, memory_match, end_time - start_time, compact, verbose
+            )
+            return result if compact else result.to_dict()
 
         except Exception as e:
             logger.error(f"❌ Translation failed: {e}")
             raise
 
-    def batch_translate(self, texts: list, debug: bool = False, **kwargs) -> list:
-        """Translate multiple texts."""
+    def _fetch_translation(self, text: str, preprocessed_text: str,
+                           priority: str = PRIORITY_INTERACTIVE, tenant: str = None):
+        """
+        Get the translation of preprocessed text, placeholders intact.
+
+        Returns:
+            Tuple of (translation, memory_match); memory_match is None when
+            the translation came from the upstream API
+        """
+        if self.translation_memory is not None:
+            memory_hit = self.translation_memory.lookup(preprocessed_text)
+            if memory_hit:
+                return memory_hit
+
+        bulk = priority == PRIORITY_BULK
+
+        def upstream(query: str) -> str:
+            if self.scheduler is None:
+                return self._google_translate_sync(query, wait_if_open=bulk)
+            while True:
+                # Bulk requests sit out an open circuit without holding a
+                # scheduler slot, so interactive requests still get one and
+                # fail fast instead of queueing behind the cooldown
+                if bulk and self.governor is not None:
+                    self.governor.wait_for_circuit()
+                with self.scheduler.slot(priority, tenant or self.tenant):
+                    try:
+                        return self._google_translate_sync(query)
+                    except CircuitOpenError:
+                        if not bulk:
+                            raise
+
+        translated_with_placeholders = upstream(preprocessed_text)
+
+        # Re-request sentences whose placeholders did not survive; a
+        # translation still broken after the retries is returned but not
+        # remembered, so the memory never reuses a silently untranslated term
+        intact = True
+        if self.placeholder_validator is not None:
+            translated_with_placeholders, intact = self.placeholder_validator.verify(
+                preprocessed_text, translated_with_placeholders, upstream
+            )
+
+        if self.translation_memory is not None and intact:
+            self.translation_memory.add(text, preprocessed_text, translated_with_placeholders)
+        return translated_with_placeholders, None
+
+    def _build_result(self, text: str, preprocessed_text: str, replacements: Dict[str, str],
+                      translated_with_placeholders: str, final_text: str,
+                      memory_match: Optional[str], translation_time: float,
+                      compact: bool, verbose: bool) -> TranslationResult:
+        """Assemble a TranslationResult, keeping verbose fields only when asked."""
+        keep = verbose or not compact
+        return TranslationResult(
+            text=final_text,
+            src=self.src_lang,
+            dest=self.target_lang,
+            src_google=self.src_lang_google,
+            dest_google=self.target_lang_google,
+            replacements_count=len(replacements),
+            translation_time=translation_time,
+            memory_match=memory_match,
+            original=text if keep else None,
+            preprocessed=preprocessed_text if keep else None,
+            google_translation=translated_with_placeholders if keep else None,
+            replaced_terms=list(replacements.keys()) if keep else None
+        )
+
+    def translate_iter(self, texts: Iterable[str], prefetch: int = 32,
+                       network_workers: int = 4, compact: bool = False,
+                       verbose: bool = False, priority: str = PRIORITY_BULK,
+                       tenant: str = None) -> Iterator[Union[Dict[str, Any], TranslationResult]]:
+        """
+        Translate a stream of texts with overlapping pipeline stages.
+
+        Preprocessing, upstream requests and postprocessing run concurrently,
+        joined by bounded queues. Results are yielded lazily in input order,
+        and at most prefetch texts are in flight at any time, so memory
+        stays bounded however long the input is. Failed texts yield error
+        results like batch_translate.
+
+        Args:
+            texts: Any iterable of texts (consumed lazily)
+            prefetch: Maximum texts between reading and yielding
+            network_workers: Threads issuing upstream requests; the adaptive
+                governor still limits how many are actually in flight
+            compact: Yield TranslationResult objects instead of dicts
+            verbose: With compact=True, keep the verbose result fields
+            priority: Scheduler class (default: 'bulk')
+            tenant: Scheduler tenant (default: the translator's tenant)
+
+        Yields:
+            One result per input text, in input order
+        """
+        from .pipeline import translate_pipelined
+        return translate_pipelined(
+            self, texts, prefetch=prefetch, network_workers=network_workers,
+            compact=compact, verbose=verbose, priority=priority, tenant=tenant
+        )
+
+    def estimate(self, texts: list, assumed_latency: float = 1.0) -> Dict[str, Any]:
+        """
+        Estimate the upstream cost of translating texts without any network calls.
+
+        Runs terminology preprocessing only and checks the translation memory
+        (without recording the lookups), counting repeats within texts as
+        cache hits when a memory is configured, since the first occurrence
+        would be stored and reused.
+
+        Args:
+            texts: Texts that would be passed to batch_translate
+            assumed_latency: Seconds per upstream request when no latency has
+                been observed yet
+
+        Returns:
+            Dictionary with text, request, character, cache hit and term
+            counts, preprocessing time and the estimated wall time in seconds
+        """
+        start_time = time.time()
+        estimate = {
+            'texts': len(texts),
+            'unique_texts': 0,
+            'requests': 0,
+            'characters_sent': 0,
+            'cache_hits': 0,
+            'terms_replaced': 0,
+        }
+
+        seen = set()
+        for text in texts:
+            preprocessed_text, replacements, _ = self.terminology_manager.preprocess_text(text)
+            estimate['terms_replaced'] += len(replacements)
+
+            is_repeat = preprocessed_text in seen
+            seen.add(preprocessed_text)
+
+            if self.translation_memory is not None and (
+                    is_repeat or self.translation_memory.lookup(preprocessed_text, record=False)):
+                estimate['cache_hits'] += 1
+                continue
+
+            estimate['requests'] += 1
+            estimate['characters_sent'] += len(preprocessed_text)
+
+        estimate['unique_texts'] = len(seen)
+        estimate['preprocess_time'] = time.time() - start_time
+
+        # Requests run one after another, each taking at least one rate interval
+        if self.governor:
+            stats = self.governor.snapshot()
+            latency = stats['latency_ewma'] or assumed_latency
+            per_request = max(1.0 / stats['rate'], latency)
+        else:
+            per_request = assumed_latency + 0.5
+        estimate['estimated_time'] = estimate['preprocess_time'] + estimate['requests'] * per_request
+
+        return estimate
+
+    def batch_translate(self, texts: list, debug: bool = False, compact: bool = False,
+                        verbose: bool = False, dry_run: bool = False,
+                        priority: str = PRIORITY_BULK, **kwargs) -> list:
+        """
+        Translate multiple texts.
+
+        With compact=True each entry is a TranslationResult without the
+        verbose fields (unless verbose=True), which keeps large batches to
+        roughly one copy of the translated corpus in memory.
+
+        With dry_run=True nothing is translated and the estimate() dictionary
+        is returned instead.
+
+        Requests go to the scheduler (if any) as 'bulk' unless priority says
+        otherwise.
+        """
+        if dry_run:
+            return self.estimate(texts)
+
         results = []
         for i, text in enumerate(texts):
             try:
@@ -173,19 +480,17 @@ class NkraneTranslator:
                     print(f"Translating text {i+1}/{len(texts)}")
                     print(f"{'='*60}")
                 
-                result = self.translate(text, debug=debug, **kwargs)
+                result = self.translate(text, debug=debug, compact=compact, verbose=verbose,
+                                        priority=priority, **kwargs)
                 results.append(result)
 
-                # Add a small delay to avoid rate limiting
-                if i < len(texts) - 1:
+                # Without the governor, add a small delay to avoid rate limiting
+                if self.governor is None and i < len(texts) - 1:
                     time.sleep(0.5)
 
             except Exception as e:
                 logger.error(f"❌ Failed to translate text {i}: {e}")
-                results.append({
-                    'text': '',
-                    'error': str(e),
-                    'original': text
-                })
+                error_result = TranslationResult(text='', error=str(e), original=text)
+                results.append(error_result if compact else error_result.to_dict())
 
         return results
@@ -1,16 +1,69 @@
 # nkrane_gt/utils.py
+import csv
+import io
 import json
-import pandas as pd
-from typing import Dict, List
-from .terminology_manager import TerminologyManager
+import os
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, TextIO, Tuple, Union
+from .compression import open_text, strip_compression_suffix
+from .terminology_manager import iter_csv_terms
 
-def list_available_options(terminology_source: str = None) -> Dict:
+SAMPLE_TERMS = [
+    ('house', 'efie'),
+    ('car', 'kaa'),
+    ('school', 'sukuu'),
+    ('water', 'nsu'),
+    ('market', 'dwabea'),
+]
+
+# Streaming export formats and the extensions that select them
+STREAM_FORMATS = {
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+    '.csv': 'csv',
+    '.tsv': 'tsv',
+}
+
+def iter_terminology(terminology_source: str) -> Iterator[Dict[str, str]]:
+    """
+    Iterate over terms in a terminology CSV without loading it into memory.
+
+    Args:
+        terminology_source: Path to terminology CSV file
+
+    Yields:
+        Dictionaries with 'term' and 'translation' keys, in file order
+    """
+    for term, translation in iter_csv_terms(terminology_source):
+        yield {'term': term, 'translation': translation}
+
+def _read_terms(terminology_source: str) -> Iterator[Tuple[str, str]]:
+    """
+    Iterate over (term, translation) pairs, reporting errors like TerminologyManager.
+
+    A missing or unreadable file yields nothing (or the rows read before
+    the error), as loading it into a TerminologyManager does.
+    """
+    try:
+        yield from iter_csv_terms(terminology_source)
+    except FileNotFoundError:
+        print(f"❌ Error: CSV file not found at '{terminology_source}'")
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+
+def _unique_terms(terminology_source: str) -> Dict[str, str]:
+    """Collapse duplicate terms like TerminologyManager.terms (later rows win)."""
+    return dict(_read_terms(terminology_source))
+
+def list_available_options(terminology_source: str = None,
+                           include_terms: bool = True) -> Dict:
     """
     List available terms from terminology CSV.
-    
+
     Args:
         terminology_source: Path to terminology CSV file
-        
+        include_terms: If False, only count the terms instead of returning them
+
     Returns:
         Dictionary with available options
     """
@@ -19,75 +72,170 @@ def list_available_options(terminology_source: str = None) -> Dict:
             'term_count': 0,
             'message': 'No terminology source provided'
         }
-    
-    manager = TerminologyManager(target_lang='en', user_csv_path=terminology_source)
-    terms = manager.terms
-    
-    return {
-        'term_count': len(terms),
-        'terms': list(terms.keys())
-    }
-
-def export_terminology(terminology_source: str, 
+
+    # Only the terms are needed, not their translations
+    terms = (term for term, _ in _read_terms(terminology_source))
+    if not include_terms:
+        return {'term_count': len(set(terms))}
+
+    unique_terms = list(dict.fromkeys(terms))
+    return {'term_count': len(unique_terms), 'terms': unique_terms}
+
+@contextmanager
+def _open_output(output: Union[str, TextIO]):
+    """Yield a writable text stream for a file path (compressed by extension) or an open stream."""
+    if isinstance(output, (str, os.PathLike)):
+        with open_text(output, 'w', newline='') as f:
+            yield f
+    else:
+        yield output
+
+def _format_from_path(path: str) -> Optional[str]:
+    """Infer a streaming export format from a file extension, ignoring .gz/.zst/.xz."""
+    if not isinstance(path, (str, os.PathLike)):
+        return None
+    return STREAM_FORMATS.get(os.path.splitext(strip_compression_suffix(path))[1].lower())
+
+def write_terms(terms: Iterator[Tuple[str, str]], output: Union[str, TextIO],
+                output_format: str = 'jsonl') -> int:
+    """
+    Write (term, translation) pairs to a file or stream one row at a time.
+
+    Args:
+        terms: Iterable of (term, translation) pairs
+        output: Output file path or writable text stream
+        output_format: 'jsonl', 'csv' or 'tsv'
+
+    Returns:
+        Number of terms written
+    """
+    if output_format not in ('jsonl', 'csv', 'tsv'):
+        raise ValueError(f"Unsupported export format: {output_format}")
+
+    count = 0
+    with _open_output(output) as f:
+        if output_format == 'jsonl':
+            for term, translation in terms:
+                f.write(json.dumps({'term': term, 'translation': translation}, ensure_ascii=False))
+                f.write('\n')
+                count += 1
+        else:
+            delimiter = '\t' if output_format == 'tsv' else ','
+            writer = csv.writer(f, delimiter=delimiter, lineterminator='\n')
+            writer.writerow(['term', 'translation'])
+            for row in terms:
+                writer.writerow(row)
+                count += 1
+    return count
+
+def stream_export_terminology(terminology_source: str, output: Union[str, TextIO],
+                              output_format: str = None) -> int:
+    """
+    Export terminology straight to a file or stream in constant memory.
+
+    Rows are copied in file order; duplicate terms are not collapsed.
+
+    Args:
+        terminology_source: Path to terminology CSV file
+        output: Output file path or writable text stream
+        output_format: 'jsonl', 'csv' or 'tsv' (default: from the output
+            extension, falling back to 'jsonl')
+
+    Returns:
+        Number of terms written
+    """
+    output_format = output_format or _format_from_path(output) or 'jsonl'
+    return write_terms(iter_csv_terms(terminology_source), output, output_format)
+
+def convert_terminology(input_path: str, output_path: str,
+                        output_format: str = None) -> int:
+    """
+    Convert a terminology file between CSV/TSV/JSONL formats.
+
+    JSONL input (one {"term", "translation"} object per line) is read
+    line by line; anything else goes through the CSV column detection.
+
+    Args:
+        input_path: Source terminology file
+        output_path: Destination file
+        output_format: Output format (default: from the output extension)
+
+    Returns:
+        Number of terms written
+    """
+    if _format_from_path(input_path) == 'jsonl':
+        terms = _iter_jsonl_terms(input_path)
+    else:
+        terms = iter_csv_terms(input_path)
+
+    output_format = output_format or _format_from_path(output_path) or 'jsonl'
+    count = write_terms(terms, output_path, output_format)
+    print(f"✅ Converted {count} terms from {input_path} to {output_path}")
+    return count
+
+def _iter_jsonl_terms(path: str) -> Iterator[Tuple[str, str]]:
+    """Stream (term, translation) pairs from a JSONL terminology file."""
+    with open_text(path, 'r') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            term = str(record.get('term', '')).strip().lower()
+            translation = str(record.get('translation', '')).strip()
+            if term and translation:
+                yield term, translation
+
+def export_terminology(terminology_source: str,
                       output_format: str = 'json') -> str:
     """
     Export terminology to various formats.
-    
+
+    Builds the whole export in memory; use stream_export_terminology for
+    large glossaries. Duplicate terms are collapsed (later rows win) and a
+    missing file gives an empty export, matching TerminologyManager.
+
     Args:
         terminology_source: Path to terminology CSV file
-        output_format: 'json', 'csv', or 'dict'
-        
+        output_format: 'json', 'jsonl', 'csv', 'tsv' or 'dict'
+
     Returns:
         Terminology in requested format
     """
-    manager = TerminologyManager(target_lang='en', user_csv_path=terminology_source)
-    terms = manager.terms
-    
-    # Convert to list of dictionaries
-    terms_list = [
-        {
-            'term': term,
-            'translation': translation
-        }
-        for term, translation in terms.items()
-    ]
-    
+    terms = _unique_terms(terminology_source)
+    terms_list = [{'term': term, 'translation': translation} for term, translation in terms.items()]
+
     if output_format == 'json':
         return json.dumps(terms_list, indent=2, ensure_ascii=False)
-    elif output_format == 'csv':
-        import io
-        import csv
-        
+    elif output_format in ('jsonl', 'csv', 'tsv'):
         output = io.StringIO()
-        if terms_list:
-            writer = csv.DictWriter(output, fieldnames=terms_list[0].keys())
-            writer.writeheader()
-            writer.writerows(terms_list)
+        write_terms(terms.items(), output, output_format)
         return output.getvalue()
     else:  # 'dict'
         return terms_list
 
-def create_sample_terminology() -> pd.DataFrame:
+def create_sample_terminology():
     """
     Create a sample terminology DataFrame for testing.
-    
+
+    Requires pandas.
+
     Returns:
         Sample terminology as DataFrame
     """
-    data = {
-        'term': ['house', 'car', 'school', 'water', 'market'],
-        'translation': ['efie', 'kaa', 'sukuu', 'nsu', 'dwabea']
-    }
-    
-    return pd.DataFrame(data)
+    try:
+        import pandas as pd
+    except ImportError:
+        raise ImportError("pandas is required for create_sample_terminology: pip install pandas")
+
+    terms, translations = zip(*SAMPLE_TERMS)
+    return pd.DataFrame({'term': list(terms), 'translation': list(translations)})
 
 def save_sample_terminology(filepath: str = 'sample_terminology.csv'):
     """
     Save sample terminology to a CSV file.
-    
+
     Args:
         filepath: Path where to save the sample terminology
     """
-    df = create_sample_terminology()
-    df.to_csv(filepath, index=False)
+    write_terms(iter(SAMPLE_TERMS), filepath, 'csv')
     print(f"✅ Sample terminology saved to {filepath}")
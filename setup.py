@@ -61,6 +61,8 @@ setup(
     entry_points={
         "console_scripts": [
             "nkrane-translate=nkrane_gt.cli:main",
+            "nkrane-daemon=nkrane_gt.daemon:main",
+            "nkrane-memory=nkrane_gt.corpus:main",
         ],
     },
     include_package_data=True,